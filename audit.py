@@ -1,12 +1,18 @@
 # structuredweb_auditor/audit.py
 
+import logging
 import sys
-import requests
+from typing import List
 from urllib.parse import urlparse
-from bs4 import BeautifulSoup
 
-from core.audit_runner import audit_page
-from core.site_report import write_combined_report
+from config import DAEMON_SOCKET, LOG_LEVEL
+from core.discovery import MESH_REPORT_NAME, collect_mesh_urls, parse_sitemap
+from core.records import PageSummary
+from core.report_writer import format_summary
+from core.urls import dedupe_urls, is_hostname
+
+# requests, bs4 and the audit pipeline are imported where they are used, so a
+# single-URL audit handled by the daemon never loads them in this process.
 
 def resolve_url(raw: str) -> str:
     if not raw.startswith(("http://", "https://")):
@@ -16,42 +22,74 @@ def resolve_url(raw: str) -> str:
         raise ValueError("Invalid URL — missing domain.")
     return raw.rstrip("/") + "/" if parsed.path in ["", "/"] else raw
 
-def parse_sitemap(sitemap_url: str) -> list:
-    try:
-        resp = requests.get(sitemap_url, timeout=10)
-        soup = BeautifulSoup(resp.content, "xml")
-        return [loc.text.strip() for loc in soup.find_all("loc")]
-    except Exception as e:
-        print(f"❌ Failed to load sitemap: {str(e)}")
-        return []
+def audit_single(url: str):
+    from core.daemon import request_audit
+
+    text = request_audit(url, DAEMON_SOCKET)
+    if text is None:
+        from core.audit_runner import audit_page
+        text = format_summary(audit_page(url))
+    print(text)
 
-def parse_mesh() -> list:
-    mesh_url = "https://structuredweb.org/mesh.json"
-    print(f"\n📡 Auto-loading mesh from: {mesh_url}")
+def audit_urls(urls: List[str]) -> List[PageSummary]:
+    from core.audit_runner import audit_page
+    from core.telemetry import CrawlTelemetry
 
+    telemetry = CrawlTelemetry(total=len(urls))
+    page_reports = []
     try:
-        resp = requests.get(mesh_url, timeout=10)
-        data = resp.json()
-    except Exception as e:
-        print(f"❌ Failed to fetch or parse mesh.json: {str(e)}")
-        return []
-
-    sitemaps = set()
-    dist = data.get("distribution", [])
-    if not isinstance(dist, list):
-        print("⚠️ 'distribution' is missing or malformed.")
-        return []
-
-    for item in dist:
-        content_url = item.get("contentUrl", "") if isinstance(item, dict) else ""
-        if "/verify.json" in content_url:
-            base_url = content_url.rsplit("/verify.json", 1)[0]
-            sitemap_url = base_url + "/sitemap.xml"
-            sitemaps.add(sitemap_url)
-
-    return sorted(sitemaps)
+        for url in urls:
+            started = telemetry.page_started()
+            result = None
+            try:
+                result = audit_page(url)
+            finally:
+                telemetry.page_finished(url, result, started)
+            page_reports.append(result)
+    finally:
+        telemetry.close()
+    return page_reports
 
 def main():
+    logging.basicConfig(level=LOG_LEVEL, format="%(levelname)s %(name)s: %(message)s")
+    args = sys.argv[1:]
+    if args and args[0] == "--serve":
+        from core.daemon import serve
+        serve(DAEMON_SOCKET)
+        return
+    if args and args[0] == "--http":
+        from core.service import serve
+        serve()
+        return
+    if args and args[0] in ("--coordinate", "--work"):
+        if len(args) < 2:
+            print(f"❌ {args[0]} needs a queue URL (sqlite:///path/queue.db or redis://host:6379/0).")
+            sys.exit(1)
+        if args[1].startswith("local://"):
+            # LocalRedis lives inside one process; workers elsewhere could never reach it
+            print(f"❌ {args[0]} needs a shared queue; local:// only works within one process.")
+            sys.exit(1)
+        from core.distributed import run_coordinator, run_worker
+        from core.work_queue import open_queue
+        try:
+            queue = open_queue(args[1])
+        except ValueError as ve:
+            print(f"❌ {ve}")
+            sys.exit(1)
+        if args[0] == "--coordinate":
+            run_coordinator(queue)
+        else:
+            run_worker(queue)
+        return
+    if args:
+        try:
+            url = resolve_url(args[0])
+        except ValueError as ve:
+            print(f"❌ {ve}")
+            sys.exit(1)
+        audit_single(url)
+        return
+
     print("Welcome to Structured Web Auditor\n")
     print("What would you like to audit?")
     print("[1] Single URL")
@@ -69,72 +107,43 @@ def main():
             sys.exit(1)
 
         print(f"\n📡 Auditing {url}...\n")
-        result = audit_page(url)
-        print_summary(result)
+        audit_single(url)
 
     elif choice == "2":
         domain = input("Enter domain (e.g., example.com): ").strip().lower()
+        if not is_hostname(domain):
+            print("\n❌ Invalid domain — enter a bare host name such as example.com.")
+            sys.exit(1)
         sitemap_url = f"https://{domain}/sitemap.xml"
 
         print(f"\n📂 Fetching sitemap: {sitemap_url}")
-        urls = parse_sitemap(sitemap_url)
+        urls = dedupe_urls(parse_sitemap(sitemap_url))
         if not urls:
             print("⚠️ No URLs found in sitemap.")
             sys.exit(1)
 
         print(f"🔍 Found {len(urls)} URLs. Beginning audit...\n")
-        page_reports = []
-        for i, url in enumerate(urls):
-            print(f"  [{i+1}/{len(urls)}] Auditing: {url}")
-            result = audit_page(url)
-            page_reports.append(result)
+        from core.site_report import write_combined_report
 
+        page_reports = audit_urls(urls)
         write_combined_report(domain, page_reports)
         print("✅ Domain-wide audit complete.")
 
     elif choice == "3":
-        sitemaps = parse_mesh()
-        if not sitemaps:
-            print("⚠️ No sitemaps found in mesh.")
+        all_urls = collect_mesh_urls()
+        if not all_urls:
+            print("⚠️ No URLs found in mesh.")
             sys.exit(1)
 
-        all_urls = []
-        for sm in sitemaps:
-            print(f"\n📂 Parsing sitemap: {sm}")
-            urls = parse_sitemap(sm)
-            if urls:
-                all_urls.extend(urls)
-
-        print(f"\n🔍 Total URLs found across mesh: {len(all_urls)}\n")
-        page_reports = []
-        for i, url in enumerate(all_urls):
-            print(f"  [{i+1}/{len(all_urls)}] Auditing: {url}")
-            result = audit_page(url)
-            page_reports.append(result)
+        from core.site_report import write_combined_report
 
-        write_combined_report("structuredweb.org", page_reports)
+        page_reports = audit_urls(all_urls)
+        write_combined_report(MESH_REPORT_NAME, page_reports)
         print("✅ Mesh-wide audit complete.")
 
     else:
         print("Invalid choice.")
         sys.exit(1)
 
-def print_summary(result: dict):
-    print("=" * 60)
-    print(f"🧾 Audit Complete: {result['url']}")
-    print(f"Status: {result['status']}")
-    print(f"Load time: {result.get('load_time_ms', 'n/a')} ms")
-    print(f"Backlink required: {result.get('backlink_required', 'n/a')}")
-    print(f"Backlink found: {result.get('backlink_found', 'n/a')}")
-    print(f"Structured Data: {result.get('structured_data_present', False)}")
-    print(f"Alignment Score: {result.get('alignment_percent', 0)}%")
-    print("\nViolations:")
-    if result.get("violations"):
-        for v in result["violations"]:
-            print(f" - {v}")
-    else:
-        print("None ✅")
-    print("=" * 60)
-
 if __name__ == "__main__":
     main()
@@ -1,24 +1,25 @@
 # structuredweb_auditor/core/audit_runner.py
 
 import os
-import requests
 from urllib.parse import urlparse
-from typing import Tuple
 
 from rules.performance import audit_performance
 from rules.schema import audit_schema
 from rules.trust import audit_backlink
 from rules.zero_trust import audit_zero_trust
+from rules.rendered_zero_trust import audit_rendered_zero_trust, render_result, should_render, submit_render
 from rules.semantic_alignment import audit_semantic_alignment
+from core.http_client import get_session
+from core.records import PageSummary, Violation
 from core.report_writer import write_page_report, write_raw_schema
 
 OUTPUT_DIR = "outputs/pages"
 RAW_SCHEMA_DIR = "outputs/pages/raw_schema"
 
-def fetch_page(url: str) -> Tuple[str, str]:
-    headers = {"User-Agent": "StructuredWebAuditor/1.0"}
-    response = requests.get(url, headers=headers, timeout=10)
-    return response.text, response.url
+def fetch_page(url: str):
+    # The page's one GET through the session; the cookie checks read this
+    # response too (the session stores no cookies, so it is a first visit).
+    return get_session().get(url, timeout=10)
 
 def sanitize_slug(url: str) -> str:
     parsed = urlparse(url)
@@ -29,58 +30,63 @@ def ensure_output_dirs():
     os.makedirs(OUTPUT_DIR, exist_ok=True)
     os.makedirs(RAW_SCHEMA_DIR, exist_ok=True)
 
-def audit_page(url: str) -> dict:
+def audit_page(url: str) -> PageSummary:
     try:
-        html_content, final_url = fetch_page(url)
+        response = fetch_page(url)
     except Exception as e:
-        return {
-            "url": url,
-            "status": "FAIL",
-            "violations": [f"Failed to fetch URL: {str(e)}"]
-        }
+        return PageSummary(url, "FAIL", violations=(Violation("fetch_failed", str(e)),))
+    html_content, final_url = response.text, response.url
+
+    # Rendered zero-trust runs on the browser pool alongside the static rules
+    render = submit_render(final_url) if should_render(final_url, static_failed=False) else None
 
     # Run audits
-    perf = audit_performance(final_url, html_content)
+    perf = audit_performance(final_url, html_content, response=response)
     schema = audit_schema(final_url, html_content)
-    trust = audit_backlink(final_url, html_content)
-    zero = audit_zero_trust(final_url, html_content)
+    trust = audit_backlink(final_url, html_content, json_ld_index=schema.json_ld_index)
+    zero = audit_zero_trust(final_url, html_content, response=response)
     alignment = audit_semantic_alignment(
         html=html_content,
-        json_ld_blocks=schema.get("json_ld_data", []),
-        microdata_items=schema.get("microdata_data", [])
+        json_ld_blocks=schema.json_ld_data,
+        microdata_items=schema.microdata_data,
+        json_ld_index=schema.json_ld_index
     )
 
     slug = sanitize_slug(final_url)
     ensure_output_dirs()
 
     all_pass = all([
-        perf["status"] == "PASS",
-        schema["status"] == "PASS",
-        trust["status"] == "PASS",
-        zero["status"] == "PASS"
+        perf.status == "PASS",
+        schema.status == "PASS",
+        trust.status == "PASS",
+        zero.status == "PASS"
     ])
 
-    is_json_page = final_url.lower().endswith(".json")
-    structured_ok = schema.get("has_json_ld", False)
+    if render is None and should_render(final_url, static_failed=not all_pass):
+        render = submit_render(final_url)
+    rendered = audit_rendered_zero_trust(final_url, render_result(render), zero.autoloaded_scripts) if render else None
+    if rendered is not None and rendered.status != "PASS":
+        all_pass = False
 
-    summary = {
-    "url": final_url,
-    "status": "PASS" if all_pass else "FAIL",
-    "load_time_ms": perf.get("load_time_ms"),
-    "backlink_required": trust.get("required"),
-    "backlink_found": trust.get("backlink_found"),
-    "backlink_score": trust.get("backlink_score", 0),
-    "alignment_percent": alignment.get("alignment_percent", 0),
-    "structured_data_present": schema.get("has_json_ld", False),
-    "violations": (
-        perf.get("violations", [])
-        + schema.get("violations", [])
-        + trust.get("violations", [])
-        + zero.get("violations", [])
-        + [f"Missing structured keyword: {term}" for term in alignment.get("missing_terms", [])]
+    summary = PageSummary(
+        url=final_url,
+        status="PASS" if all_pass else "FAIL",
+        load_time_ms=perf.load_time_ms,
+        backlink_required=trust.required,
+        backlink_found=trust.backlink_found,
+        backlink_score=trust.backlink_score,
+        alignment_percent=alignment.alignment_percent,
+        structured_data_present=schema.has_json_ld,
+        violations=tuple(
+            perf.violations
+            + schema.violations
+            + trust.violations
+            + zero.violations
+            + (rendered.violations if rendered else [])
+            + [Violation("missing_keyword", term) for term in alignment.missing_terms]
+        )
     )
-}
-    write_page_report(slug, final_url, summary, schema, alignment, debug_logs=zero.get("debug_log", []))
-    write_raw_schema(slug, schema.get("json_ld_data", []))
+    write_page_report(slug, final_url, summary, schema, alignment, debug_logs=zero.debug_log + (rendered.debug_log if rendered else []))
+    write_raw_schema(slug, schema.json_ld_data)
 
     return summary
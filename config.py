@@ -1,5 +1,7 @@
 # structuredweb_auditor/config.py
 
+import os
+
 # Paths
 OUTPUT_DIR = "outputs"
 PAGES_DIR = f"{OUTPUT_DIR}/pages"
@@ -9,6 +11,40 @@ RAW_SCHEMA_DIR = f"{PAGES_DIR}/raw_schema"
 # User-Agent
 USER_AGENT = "StructuredWebAuditor/1.0"
 
+# Local audit daemon (single-URL mode); override with SWA_SOCKET. Lives in a
+# per-user directory so other local users can't bind or answer on it.
+DAEMON_SOCKET = os.environ.get("SWA_SOCKET") or os.path.join(
+    os.environ.get("XDG_RUNTIME_DIR")
+    or os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"), "structuredweb-auditor"),
+    "structuredweb-auditor.sock",
+)
+
+# Local audit service (HTTP/JSON job API)
+SERVICE_HOST = "127.0.0.1"
+SERVICE_PORT = 8787
+SERVICE_WORKERS = 4  # pages audited concurrently
+SERVICE_JOB_RUNNERS = 2  # jobs expanded/collected concurrently; the rest wait queued
+SERVICE_MAX_FINISHED_JOBS = 500  # oldest finished jobs are forgotten beyond this
+
+# Distributed mesh audits (coordinator/worker)
+SHARD_MAX_URLS = 200  # hosts with more pages are split across shards
+LEASE_SECONDS = 120  # a worker silent this long loses its shard to another worker
+WORKER_POLL_SECONDS = 5
+
+# Logging and progress. Rule debug output is logged at DEBUG/INFO, so it is
+# silent unless SWA_LOG_LEVEL is lowered (e.g. SWA_LOG_LEVEL=DEBUG).
+LOG_LEVEL = os.environ.get("SWA_LOG_LEVEL", "WARNING").upper()
+STATUS_REFRESH_SECONDS = 0.5  # crawl status line redraw interval
+
+# Rendered (headless browser) zero-trust audit — needs playwright.
+# off | failing (pages the static rules failed) | sample (RENDER_SAMPLE_RATE of pages) | all
+RENDER_MODE = os.environ.get("SWA_RENDER", "off")
+RENDER_SAMPLE_RATE = 0.05
+RENDER_POOL_SIZE = 2  # long-lived browser contexts shared by all audits
+RENDER_TIMEOUT_MS = 15000
+RENDER_SETTLE_MS = 750  # wait after load for timers that inject overlays/scripts
+RENDER_WAIT_MARGIN_MS = 5000  # on top of timeout + settle before an audit gives up on a render
+
 # Backlink enforcement
 REQUIRED_BACKLINK_PATHS = ["/", "/verify.html", "/verify.json"]
 TRUST_URL = "https://structuredweb.org/verify"
@@ -0,0 +1,98 @@
+# structuredweb_auditor/core/daemon.py
+
+import json
+import os
+import socket
+from typing import Optional
+
+# The client half of this module is imported on every single-URL run, so it
+# sticks to the standard library; the audit pipeline loads only inside serve().
+
+def _owned_by_us(socket_path: str) -> bool:
+    # Never talk to a socket another user put in place
+    try:
+        return not hasattr(os, "getuid") or os.stat(socket_path).st_uid == os.getuid()
+    except OSError:
+        return False
+
+def _daemon_alive(socket_path: str) -> bool:
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(socket_path)
+        return True
+    except OSError:
+        return False
+
+def request_audit(url: str, socket_path: str, timeout: float = 120) -> Optional[str]:
+    # Returns the formatted summary from a running daemon, or None when there is
+    # no daemon to ask and the caller should audit in-process.
+    if not hasattr(socket, "AF_UNIX") or not _owned_by_us(socket_path):
+        return None
+
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(timeout)
+            sock.connect(socket_path)
+            sock.sendall(json.dumps({"url": url}).encode("utf-8") + b"\n")
+            with sock.makefile("rb") as f:
+                line = f.readline()
+    except OSError:
+        return None
+
+    if not line:
+        return None
+    reply = json.loads(line)
+    if "error" in reply:
+        return f"❌ Daemon audit failed: {reply['error']}"
+    return reply["text"]
+
+def serve(socket_path: str):
+    import socketserver
+
+    import bs4  # noqa: F401 — load the parser backend before the first request
+    from core.audit_runner import audit_page
+    from core.http_client import get_session
+    from core.report_writer import format_summary
+
+    if not hasattr(socket, "AF_UNIX"):
+        print("❌ Daemon mode needs Unix domain sockets.")
+        return
+    socket_dir = os.path.dirname(socket_path)
+    if socket_dir:
+        os.makedirs(socket_dir, mode=0o700, exist_ok=True)
+    if os.path.exists(socket_path):
+        if _daemon_alive(socket_path):
+            print(f"⚠️ A daemon is already listening on {socket_path}")
+            return
+        os.unlink(socket_path)
+
+    get_session()
+
+    class AuditHandler(socketserver.StreamRequestHandler):
+        def handle(self):
+            line = self.rfile.readline()
+            if not line:
+                return
+            try:
+                url = json.loads(line)["url"]
+                reply = {"text": format_summary(audit_page(url))}
+            except Exception as e:
+                reply = {"error": str(e)}
+            self.wfile.write(json.dumps(reply, ensure_ascii=False).encode("utf-8") + b"\n")
+
+    # Created owner-only (0600) from the start, not chmod-ed after binding
+    old_umask = os.umask(0o177)
+    try:
+        server = socketserver.ThreadingUnixStreamServer(socket_path, AuditHandler)
+    finally:
+        os.umask(old_umask)
+    server.daemon_threads = True
+    print(f"📡 Audit daemon listening on {socket_path} (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
@@ -0,0 +1,57 @@
+# structuredweb_auditor/core/discovery.py
+
+from typing import List
+
+from core.http_client import get_session
+from core.urls import dedupe_urls
+
+MESH_URL = "https://structuredweb.org/mesh.json"
+MESH_REPORT_NAME = "structuredweb.org"
+
+def parse_sitemap(sitemap_url: str) -> list:
+    from bs4 import BeautifulSoup
+
+    try:
+        resp = get_session().get(sitemap_url, timeout=10)
+        soup = BeautifulSoup(resp.content, "xml")
+        return [loc.text.strip() for loc in soup.find_all("loc")]
+    except Exception as e:
+        print(f"❌ Failed to load sitemap: {str(e)}")
+        return []
+
+def parse_mesh() -> list:
+    mesh_url = MESH_URL
+    print(f"\n📡 Auto-loading mesh from: {mesh_url}")
+
+    try:
+        resp = get_session().get(mesh_url, timeout=10)
+        data = resp.json()
+    except Exception as e:
+        print(f"❌ Failed to fetch or parse mesh.json: {str(e)}")
+        return []
+
+    sitemaps = set()
+    dist = data.get("distribution", [])
+    if not isinstance(dist, list):
+        print("⚠️ 'distribution' is missing or malformed.")
+        return []
+
+    for item in dist:
+        content_url = item.get("contentUrl", "") if isinstance(item, dict) else ""
+        if "/verify.json" in content_url:
+            base_url = content_url.rsplit("/verify.json", 1)[0]
+            sitemap_url = base_url + "/sitemap.xml"
+            sitemaps.add(sitemap_url)
+
+    return sorted(sitemaps)
+
+def collect_mesh_urls() -> List[str]:
+    # Every page listed by every mesh sitemap, each page once
+    all_urls = []
+    for sm in parse_mesh():
+        print(f"\n📂 Parsing sitemap: {sm}")
+        all_urls.extend(parse_sitemap(sm))
+
+    urls = dedupe_urls(all_urls)
+    print(f"\n🔍 Total URLs found across mesh: {len(urls)} ({len(all_urls) - len(urls)} duplicates skipped)\n")
+    return urls
@@ -0,0 +1,109 @@
+# structuredweb_auditor/core/distributed.py
+
+import os
+import socket
+import time
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from config import LEASE_SECONDS, SHARD_MAX_URLS, WORKER_POLL_SECONDS
+from core.discovery import MESH_REPORT_NAME, collect_mesh_urls
+from core.records import PageSummary, Violation
+from core.urls import dedupe_urls
+from core.work_queue import WorkQueue
+
+def _shard_positions(urls: List[str], max_urls: int) -> List[Tuple[str, List[int]]]:
+    # Shards never mix hosts, so each host is crawled by one worker at a time
+    # unless it has more than max_urls pages.
+    by_host: Dict[str, List[int]] = {}
+    for i, url in enumerate(urls):
+        by_host.setdefault(urlparse(url).netloc.lower(), []).append(i)
+    return [
+        (host, positions[start:start + max_urls])
+        for host, positions in by_host.items()
+        for start in range(0, len(positions), max_urls)
+    ]
+
+def run_coordinator(
+    queue: WorkQueue,
+    urls: Optional[List[str]] = None,
+    report_name: str = MESH_REPORT_NAME,
+    poll_seconds: float = WORKER_POLL_SECONDS,
+    max_urls: int = SHARD_MAX_URLS,
+) -> List[PageSummary]:
+    from core.site_report import write_combined_report
+
+    urls = collect_mesh_urls() if urls is None else dedupe_urls(urls)
+    if not urls:
+        print("⚠️ No URLs found to distribute.")
+        return []
+
+    shards = _shard_positions(urls, max_urls)
+    queue.reset()
+    shard_ids = queue.put_shards([(host, [urls[i] for i in positions]) for host, positions in shards])
+    print(f"\n🔍 {len(urls)} URLs queued in {len(shard_ids)} host shards. Waiting for workers...\n")
+
+    last_done = None
+    while not queue.finished():
+        done, total = queue.progress()
+        if done != last_done:
+            print(f"  [{done}/{total}] shards complete")
+            last_done = done
+        time.sleep(poll_seconds)
+
+    # Put pages back in discovery order before reporting
+    results = queue.results()
+    summaries: List[Optional[PageSummary]] = [None] * len(urls)
+    for shard_id, (host, positions) in zip(shard_ids, shards):
+        for i, data in zip(positions, results[shard_id]):
+            summaries[i] = PageSummary.from_dict(data)
+
+    write_combined_report(report_name, summaries)
+    print("✅ Distributed audit complete.")
+    return summaries
+
+def run_worker(
+    queue: WorkQueue,
+    worker_id: Optional[str] = None,
+    lease_seconds: float = LEASE_SECONDS,
+    poll_seconds: float = WORKER_POLL_SECONDS,
+) -> int:
+    # Audits shards until the run is finished; returns the number of pages audited
+    from core.audit_runner import audit_page
+    from core.telemetry import CrawlTelemetry
+
+    telemetry = CrawlTelemetry(live=False)
+    worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+    print(f"🛠 Worker {worker_id} waiting for shards...")
+
+    audited = 0
+    while True:
+        shard = queue.lease(worker_id, lease_seconds)
+        if shard is None:
+            if queue.finished():
+                break
+            time.sleep(poll_seconds)
+            continue
+
+        summaries = []
+        for url in shard.urls:
+            started = telemetry.page_started()
+            try:
+                summary = audit_page(url)
+            except Exception as e:
+                summary = PageSummary(url, "FAIL", violations=(Violation("audit_error", str(e)),))
+            telemetry.page_finished(url, summary, started)
+            summaries.append(summary.to_dict())
+            # Lease lost (expired and reassigned, or a new run started): another
+            # worker owns this host now, so stop instead of crawling it twice
+            if not queue.renew(shard.id, worker_id, lease_seconds):
+                break
+
+        audited += len(summaries)
+        if len(summaries) == len(shard.urls) and queue.complete(shard.id, worker_id, summaries):
+            print(f"  ✔ Shard {shard.id} ({shard.host}): {len(summaries)} pages · {telemetry.status_line().strip()}")
+        else:
+            print(f"  ✘ Shard {shard.id} ({shard.host}): lease lost after {len(summaries)} pages, dropped")
+
+    print(f"✅ Worker {worker_id} finished after {audited} pages.")
+    return audited
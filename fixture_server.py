@@ -0,0 +1,43 @@
+# structuredweb_auditor/tools/fixture_server.py
+
+import functools
+import sys
+import threading
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+
+# Serves a fixture directory (e.g. fixtures/rendered) on localhost so audits
+# can run against known pages without touching the network.
+
+class FixtureHandler(SimpleHTTPRequestHandler):
+    def end_headers(self):
+        # Per-path extra headers, e.g. {"/cookie.html": {"Set-Cookie": "a=1"}}
+        path = self.path.split("?", 1)[0]
+        for name, value in self.server.extra_headers.get(path, {}).items():
+            self.send_header(name, value)
+        super().end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+def start_fixture_server(
+    root: str,
+    port: int = 0,
+    headers: Optional[Dict[str, Dict[str, str]]] = None,
+) -> Tuple[ThreadingHTTPServer, str]:
+    # Returns the running server and its base URL; port 0 picks a free port
+    server = ThreadingHTTPServer(("127.0.0.1", port), functools.partial(FixtureHandler, directory=root))
+    server.extra_headers = headers or {}
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="swa-fixtures", daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+if __name__ == "__main__":
+    root = sys.argv[1] if len(sys.argv) > 1 else "fixtures"
+    port = int(sys.argv[2]) if len(sys.argv) > 2 else 8765
+    server, base_url = start_fixture_server(root, port)
+    print(f"Serving {root} at {base_url}/ (Ctrl+C to stop)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -0,0 +1 @@
+window.__lateScriptLoaded = true;
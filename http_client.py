@@ -0,0 +1,25 @@
+# structuredweb_auditor/core/http_client.py
+
+import threading
+
+from config import USER_AGENT
+
+_session = None
+_session_lock = threading.Lock()
+
+def get_session():
+    # One pooled session per process, created on first use so that importing
+    # the auditor never pays for requests/urllib3. The session never stores
+    # cookies: every request must look like a first visit for the cookie checks.
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                import requests
+                from http.cookiejar import DefaultCookiePolicy
+
+                session = requests.Session()
+                session.headers["User-Agent"] = USER_AGENT
+                session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+                _session = session
+    return _session
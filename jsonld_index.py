@@ -0,0 +1,40 @@
+# structuredweb_auditor/core/jsonld_index.py
+
+from typing import Any, Dict, Iterable, List, Set
+
+class JsonLdIndex:
+    # Flattens a page's JSON-LD blocks in one pass: every object — top-level,
+    # inside @graph or nested under a property — is visited once, and every
+    # property is filed under its lowercased name. Rules then look things up
+    # here instead of walking the tree again.
+    __slots__ = ("props", "values")
+
+    def __init__(self, blocks: Iterable[Any]):
+        # lowercased property → every value it holds, in document order
+        self.props: Dict[str, List[Any]] = {}
+        # every string held directly by a property, stripped and lowercased
+        self.values: Set[str] = set()
+
+        stack = list(reversed(list(blocks)))
+        while stack:
+            obj = stack.pop()
+            if isinstance(obj, list):
+                stack.extend(reversed(obj))
+                continue
+            if not isinstance(obj, dict):
+                continue
+
+            children = []
+            for key, value in obj.items():
+                self.props.setdefault(key.lower(), []).append(value)
+                if isinstance(value, str):
+                    self.values.add(value.strip().lower())
+                elif isinstance(value, (dict, list)):
+                    children.append(value)
+            stack.extend(reversed(children))
+
+    def get(self, prop: str) -> List[Any]:
+        return self.props.get(prop.lower(), [])
+
+    def has_value(self, text: str) -> bool:
+        return text.strip().lower() in self.values
@@ -1,63 +1,135 @@
 # structuredweb_auditor/core/meta_score.py
 
-from typing import List, Dict
+from typing import List, Dict, Union
 
-def compute_page_score(report: Dict) -> int:
-    score = 100
+import numpy as np
 
-    url = report.get("url", "").lower()
-    path = "/" + url.split("/", 3)[-1].split("?", 1)[0].split("#", 1)[0]
-    if path in ["/", "/index.html"]:
-        path = "/"
+from config import ALIGNMENT_THRESHOLD, HOMEPAGE_MAX_LOAD_MS
+from core.page_table import PageTable, PATH_HOME, PATH_VERIFY_HTML, PATH_VERIFY_JSON
+from core.records import PageSummary
 
-    backlink_scored_paths = {"/", "/verify.html", "/verify.json"}
+class ScoreWeights:
+    __slots__ = (
+        "structured_data", "backlink_point", "backlink_max", "zero_trust",
+        "slow_homepage", "homepage_max_load_ms", "alignment", "alignment_threshold", "fail",
+    )
+
+    def __init__(
+        self,
+        structured_data: float = 25,
+        backlink_point: float = 10,
+        backlink_max: int = 2,
+        zero_trust: float = 25,
+        slow_homepage: float = 10,
+        homepage_max_load_ms: int = HOMEPAGE_MAX_LOAD_MS,
+        alignment: float = 10,
+        alignment_threshold: float = ALIGNMENT_THRESHOLD,
+        fail: float = 5,
+    ):
+        self.structured_data = structured_data
+        self.backlink_point = backlink_point
+        self.backlink_max = backlink_max
+        self.zero_trust = zero_trust
+        self.slow_homepage = slow_homepage
+        self.homepage_max_load_ms = homepage_max_load_ms
+        self.alignment = alignment
+        self.alignment_threshold = alignment_threshold
+        self.fail = fail
+
+DEFAULT_WEIGHTS = ScoreWeights()
+
+def _as_table(pages: Union[PageTable, List[PageSummary]]) -> PageTable:
+    return pages if isinstance(pages, PageTable) else PageTable.from_reports(pages)
+
+def score_pages(table: PageTable, weights: ScoreWeights = DEFAULT_WEIGHTS) -> np.ndarray:
+    w = weights
+    is_home = table.path_class == PATH_HOME
+    score = np.full(len(table), 100.0)
 
     # 25% — Structured Data (mandatory)
-    if not report.get("structured_data_present", False):
-        score -= 25
+    score -= np.where(table.structured, 0, w.structured_data)
 
     # 20% — Backlink score (only on root and verify paths)
-    if path in backlink_scored_paths:
-        backlink_score = report.get("backlink_score")
-        if isinstance(backlink_score, int):
-            max_backlink_per_page = 2
-            penalty = (max_backlink_per_page - backlink_score) * 10
-            score -= penalty
+    scored = np.isin(table.path_class, (PATH_HOME, PATH_VERIFY_HTML, PATH_VERIFY_JSON))
+    scored &= table.backlink_score >= 0
+    # backlink_score is stored as int8; widen before weighting so large weights can't wrap
+    backlink = table.backlink_score.astype(np.float64)
+    score -= np.where(scored, (w.backlink_max - backlink) * w.backlink_point, 0)
 
     # 25% — Zero Trust (cookies, popups, autoloaded JS)
-    if any(
-        "cookie" in v.lower() or "popup" in v.lower() or "autoloaded js" in v.lower()
-        for v in report.get("violations", [])
-    ):
-        score -= 25
+    score -= np.where(table.zero_trust, w.zero_trust, 0)
 
     # 10% — Load Time (only homepage punished if >1s)
-    if path == "/" and report.get("load_time_ms", 0) > 1000:
-        score -= 10
+    score -= np.where(is_home & (table.load_time_ms > w.homepage_max_load_ms), w.slow_homepage, 0)
 
     # 10% — Semantic Alignment (proportional penalty below 70%)
-    alignment = report.get("alignment_percent", 100)
-    if alignment < 70:
-        score -= round((70 - alignment) * (10 / 70), 2)
+    alignment = np.where(np.isnan(table.alignment), 100.0, table.alignment)
+    shortfall = np.clip(w.alignment_threshold - alignment, 0, None)
+    score -= np.round(shortfall * (w.alignment / w.alignment_threshold), 2)
 
     # 5% — Overall FAIL
-    if report.get("status") != "PASS":
-        score -= 5
+    score -= np.where(table.passed, 0, w.fail)
+
+    return np.clip(np.trunc(score), 0, None).astype(int)
 
-    return max(int(score), 0)
+def compute_page_score(report: PageSummary, weights: ScoreWeights = DEFAULT_WEIGHTS) -> int:
+    return int(score_pages(PageTable.from_reports([report]), weights)[0])
 
+def participation(table: PageTable) -> Dict:
+    # Last scored page per slot wins, matching the order pages were audited in
+    def last_score(path_class: int) -> int:
+        rows = np.flatnonzero((table.path_class == path_class) & (table.backlink_score >= 0))
+        return int(table.backlink_score[rows[-1]]) if rows.size else 0
 
-def compute_sitewide_score(page_reports: List[Dict]) -> Dict:
-    scores = [compute_page_score(report) for report in page_reports]
-    average = round(sum(scores) / len(scores), 2) if scores else 0
-    alignment_values = [r.get("alignment_percent", 0) for r in page_reports]
-    average_alignment = round(sum(alignment_values) / len(alignment_values), 2) if alignment_values else 0
+    verify_html = last_score(PATH_VERIFY_HTML)
+    verify_json = last_score(PATH_VERIFY_JSON)
+    home = last_score(PATH_HOME)
+    total = min(verify_html, 2) + min(verify_json, 1) + min(home, 1)
+
+    if total == 4:
+        grade = "🟢 Perfect"
+    elif total == 3:
+        grade = "✅ Good Standing"
+    elif total == 2:
+        grade = "⚠ Needs Work"
+    else:
+        grade = "❌ Not Eligible"
 
     return {
-        "page_scores": scores,
-        "average_score": average,
-        "average_alignment": average_alignment,
-        "pages_passed": sum(1 for r in page_reports if r.get("status") == "PASS"),
-        "pages_failed": sum(1 for r in page_reports if r.get("status") != "PASS"),
-        "total_pages": len(scores)
+        "verify_html_score": verify_html,
+        "verify_json_score": verify_json,
+        "home_score": home,
+        "total_backlink_score": total,
+        "backlink_grade": grade,
     }
+
+def compute_sitewide_score(
+    pages: Union[PageTable, List[PageSummary]],
+    weights: ScoreWeights = DEFAULT_WEIGHTS,
+) -> Dict:
+    table = _as_table(pages)
+    scores = score_pages(table, weights)
+    total = len(table)
+    alignment = np.nan_to_num(table.alignment, nan=0.0)
+    passed = int(np.count_nonzero(table.passed))
+
+    return {
+        "page_scores": scores.tolist(),
+        "average_score": round(float(scores.mean()), 2) if total else 0,
+        "average_alignment": round(float(alignment.mean()), 2) if total else 0,
+        "pages_passed": passed,
+        "pages_failed": total - passed,
+        "total_pages": total,
+        **participation(table),
+    }
+
+def compute_per_site_scores(
+    pages: Union[PageTable, List[PageSummary]],
+    weights: ScoreWeights = DEFAULT_WEIGHTS,
+) -> Dict[str, Dict]:
+    table = _as_table(pages)
+    sites = np.unique(table.site)
+    return {str(site): compute_sitewide_score(table.select(table.site == site), weights) for site in sites}
+
+def rescore_run(path: str, weights: ScoreWeights = DEFAULT_WEIGHTS) -> Dict:
+    return compute_sitewide_score(PageTable.load(path), weights)
@@ -0,0 +1,88 @@
+# structuredweb_auditor/core/page_table.py
+
+from typing import List
+from urllib.parse import urlparse
+
+import numpy as np
+
+from core.records import PageSummary, ZERO_TRUST_CODES
+from core.urls import canonical_path
+
+# Path classes — the only part of a page's URL that scoring cares about
+PATH_OTHER = 0
+PATH_HOME = 1
+PATH_VERIFY_HTML = 2
+PATH_VERIFY_JSON = 3
+
+COLUMNS = (
+    "url", "site", "path_class", "structured", "backlink_score",
+    "zero_trust", "load_time_ms", "alignment", "passed",
+)
+
+def classify_path(url: str) -> int:
+    try:
+        path = canonical_path(urlparse(url.lower()).path)
+    except ValueError:
+        return PATH_OTHER
+    if path == "/":
+        return PATH_HOME
+    if path in ("/verify", "/verify.html"):
+        return PATH_VERIFY_HTML
+    if path == "/verify.json":
+        return PATH_VERIFY_JSON
+    return PATH_OTHER
+
+def _host(url: str) -> str:
+    try:
+        return urlparse(url.lower()).netloc
+    except ValueError:
+        return ""
+
+
+class PageTable:
+    # One row per audited page, one array per fact. Missing values are encoded
+    # in-band: backlink_score -1 (not scored), load_time_ms 0, alignment NaN.
+    __slots__ = COLUMNS
+
+    def __init__(self, **columns):
+        for name in COLUMNS:
+            setattr(self, name, columns[name])
+
+    def __len__(self) -> int:
+        return len(self.path_class)
+
+    @classmethod
+    def from_reports(cls, page_reports: List[PageSummary]) -> "PageTable":
+        urls = [r.url for r in page_reports]
+        return cls(
+            url=np.array(urls, dtype=str),
+            site=np.array([_host(u) for u in urls], dtype=str),
+            path_class=np.array([classify_path(u) for u in urls], dtype=np.int8),
+            structured=np.array([bool(r.structured_data_present) for r in page_reports], dtype=bool),
+            backlink_score=np.array(
+                [r.backlink_score if isinstance(r.backlink_score, int) else -1 for r in page_reports],
+                dtype=np.int8,
+            ),
+            zero_trust=np.array(
+                [any(v.code in ZERO_TRUST_CODES for v in r.violations) for r in page_reports],
+                dtype=bool,
+            ),
+            load_time_ms=np.array([r.load_time_ms or 0 for r in page_reports], dtype=np.int64),
+            alignment=np.array(
+                [np.nan if r.alignment_percent is None else r.alignment_percent for r in page_reports],
+                dtype=np.float64,
+            ),
+            passed=np.array([r.status == "PASS" for r in page_reports], dtype=bool),
+        )
+
+    def select(self, mask: np.ndarray) -> "PageTable":
+        return PageTable(**{name: getattr(self, name)[mask] for name in COLUMNS})
+
+    def save(self, path: str):
+        with open(path, "wb") as f:
+            np.savez_compressed(f, **{name: getattr(self, name) for name in COLUMNS})
+
+    @classmethod
+    def load(cls, path: str) -> "PageTable":
+        with np.load(path, allow_pickle=False) as data:
+            return cls(**{name: data[name] for name in COLUMNS})
@@ -1,40 +1,37 @@
 # structuredweb_auditor/rules/performance.py
 
 import time
-import requests
-from bs4 import BeautifulSoup
 from urllib.parse import urlparse
 
+from core.http_client import get_session
+from core.urls import canonical_path
+from core.records import PerformanceResult
+
 USER_AGENT = "StructuredWebAuditor/1.0"
 
-def audit_performance(url: str, html_content: str) -> dict:
-    result = {
-        "load_time_ms": None,
-        "status": "PASS",
-        "violations": [],
-        "autoloaded_js": [],
-        "cookies_set": []
-    }
+def audit_performance(url: str, html_content: str, response=None) -> PerformanceResult:
+    import requests
+    from bs4 import BeautifulSoup
+
+    result = PerformanceResult()
 
-    # 1. Measure load time
+    # 1. Measure load time (fresh connection, so handshakes count as they would for a visitor)
     try:
         headers = {"User-Agent": USER_AGENT}
         start = time.perf_counter()
         response = requests.get(url, headers=headers, timeout=10)
         end = time.perf_counter()
-        result["load_time_ms"] = int((end - start) * 1000)
+        result.load_time_ms = int((end - start) * 1000)
     except Exception as e:
-        result["status"] = "FAIL"
-        result["violations"].append(f"Page load error: {str(e)}")
+        result.fail("page_load_error", str(e))
         return result
 
     # Homepage speed rule
     parsed_url = urlparse(url)
-    is_homepage = parsed_url.path in ["/", ""]
+    is_homepage = canonical_path(parsed_url.path) == "/"
 
-    if is_homepage and result["load_time_ms"] > 1000:
-        result["status"] = "FAIL"
-        result["violations"].append(f"Homepage load time exceeds 1 second: {result['load_time_ms']}ms")
+    if is_homepage and result.load_time_ms > 1000:
+        result.fail("homepage_slow", result.load_time_ms)
 
     # 2. Parse HTML for JS includes
     soup = BeautifulSoup(html_content, "html.parser")
@@ -42,24 +39,21 @@ def audit_performance(url: str, html_content: str) -> dict:
     for tag in script_tags:
         src = tag["src"]
         if not any(allowed in src for allowed in ["kworker", "durable", "edge"]):
-            result["autoloaded_js"].append(src)
+            result.autoloaded_js.append(src)
 
-    if result["autoloaded_js"] and not is_homepage:
-        result["status"] = "FAIL"
-        result["violations"].append(f"Autoloaded JS found: {result['autoloaded_js']}")
+    if result.autoloaded_js and not is_homepage:
+        result.fail("perf_autoloaded_js", tuple(result.autoloaded_js))
 
-    # 3. Check cookies
-    jar = requests.cookies.RequestsCookieJar()
+    # 3. Check cookies, on the page's own response when the caller passes it
     try:
-        resp = requests.get(url, headers=headers, cookies=jar)
+        resp = response if response is not None else get_session().get(url, timeout=10)
         if resp.cookies:
             for c in resp.cookies:
-                result["cookies_set"].append(f"{c.name}={c.value}")
+                result.cookies_set.append(f"{c.name}={c.value}")
     except:
         pass
 
-    if result["cookies_set"] and not is_homepage:
-        result["status"] = "FAIL"
-        result["violations"].append("Autoloaded cookies set without user interaction")
+    if result.cookies_set and not is_homepage:
+        result.fail("perf_cookies")
 
     return result
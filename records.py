@@ -0,0 +1,211 @@
+# structuredweb_auditor/core/records.py
+
+from typing import Dict, List, Optional, Tuple
+
+# Violation codes → report text. Rules store the code plus its parameters;
+# the text is only rendered when a report is written or printed.
+VIOLATION_MESSAGES = {
+    "fetch_failed": "Failed to fetch URL: {}",
+    "audit_error": "Audit error: {}",
+    "page_load_error": "Page load error: {}",
+    "homepage_slow": "Homepage load time exceeds 1 second: {}ms",
+    "perf_autoloaded_js": "Autoloaded JS found: {}",
+    "perf_cookies": "Autoloaded cookies set without user interaction",
+    "json_unsupported": "Unsupported JSON structure.",
+    "json_invalid": "Invalid JSON.",
+    "no_structured_data": "No structured data found.",
+    "verify_json_backlink": "Missing required isPartOf backlink in /verify.json structured data.",
+    "sd_backlink_missing": "{} is missing isPartOf backlink in structured data.",
+    "html_backlink_missing": "{} is missing visible HTML link to {}",
+    "verify_backlink_both": "{} must contain both structured data and visible HTML backlink.",
+    "zt_autoloaded_js": "Autoloaded JS on non-homepage: {}",
+    "zt_cookies": "Cookies set without interaction",
+    "zt_popup": "Popup or overlay detected on load",
+    "missing_keyword": "Missing structured keyword: {}",
+    "rendered_cookies": "Cookies written by page scripts without interaction: {}",
+    "rendered_scripts": "Scripts injected at runtime on non-homepage: {}",
+    "rendered_overlay": "Visible overlay rendered on load: {}",
+}
+
+# Codes that count as zero-trust breaches (cookies, popups, autoloaded JS) in scoring
+ZERO_TRUST_CODES = frozenset([
+    "perf_autoloaded_js", "perf_cookies",
+    "zt_autoloaded_js", "zt_cookies", "zt_popup",
+    "rendered_cookies", "rendered_scripts", "rendered_overlay",
+])
+
+
+class Violation:
+    __slots__ = ("code", "params")
+
+    def __init__(self, code: str, *params):
+        self.code = code
+        self.params = params
+
+    def format(self) -> str:
+        args = [list(p) if isinstance(p, tuple) else p for p in self.params]
+        return VIOLATION_MESSAGES[self.code].format(*args)
+
+    def __str__(self) -> str:
+        return self.format()
+
+    def __repr__(self) -> str:
+        return f"Violation({self.code!r}, {', '.join(map(repr, self.params))})"
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, Violation) and (self.code, self.params) == (other.code, other.params)
+
+    def __hash__(self) -> int:
+        return hash((self.code, self.params))
+
+    def to_dict(self) -> Dict:
+        return {"code": self.code, "params": list(self.params), "message": self.format()}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "Violation":
+        return cls(data["code"], *[tuple(p) if isinstance(p, list) else p for p in data.get("params", [])])
+
+
+class RuleResult:
+    __slots__ = ("status", "violations")
+
+    def __init__(self):
+        self.status = "PASS"
+        self.violations: List[Violation] = []
+
+    def fail(self, code: str, *params):
+        self.status = "FAIL"
+        self.violations.append(Violation(code, *params))
+
+
+class PerformanceResult(RuleResult):
+    __slots__ = ("load_time_ms", "autoloaded_js", "cookies_set")
+
+    def __init__(self):
+        super().__init__()
+        self.load_time_ms: Optional[int] = None
+        self.autoloaded_js: List[str] = []
+        self.cookies_set: List[str] = []
+
+
+class MicrodataItem:
+    __slots__ = ("type", "props")
+
+    def __init__(self, type: str, props: Dict[str, str]):
+        self.type = type
+        self.props = props
+
+
+class SchemaResult(RuleResult):
+    # microdata_html holds the serialized itemscope elements for the page report
+    # only; audit_page hands it to the writer and drops it straight after.
+    __slots__ = ("has_json_ld", "has_microdata", "json_ld_data", "json_ld_index", "microdata_data", "microdata_html")
+
+    def __init__(self):
+        super().__init__()
+        self.has_json_ld = False
+        self.has_microdata = False
+        self.json_ld_data: List[dict] = []
+        self.json_ld_index = None  # core.jsonld_index.JsonLdIndex, set by audit_schema
+        self.microdata_data: List[MicrodataItem] = []
+        self.microdata_html: List[str] = []
+
+
+class TrustResult(RuleResult):
+    __slots__ = ("required", "backlink_found", "html_backlink", "sd_backlink", "backlink_score")
+
+    def __init__(self, required: bool):
+        super().__init__()
+        self.required = required
+        self.backlink_found = False
+        self.html_backlink = False
+        self.sd_backlink = False
+        self.backlink_score: Optional[int] = None
+
+
+class ZeroTrustResult(RuleResult):
+    __slots__ = ("autoloaded_scripts", "blocked_cookies", "popup_detected", "debug_log")
+
+    def __init__(self):
+        super().__init__()
+        self.autoloaded_scripts: List[str] = []
+        self.blocked_cookies: List[str] = []
+        self.popup_detected = False
+        self.debug_log: List[str] = []
+
+
+class RenderedPage:
+    # What a headless browser saw after load; error is set when rendering failed
+    __slots__ = ("cookie_writes", "script_urls", "overlays", "error")
+
+    def __init__(self, cookie_writes: List[str] = None, script_urls: List[str] = None,
+                 overlays: List[str] = None, error: Optional[str] = None):
+        self.cookie_writes = cookie_writes or []
+        self.script_urls = script_urls or []
+        self.overlays = overlays or []
+        self.error = error
+
+
+class RenderedResult(RuleResult):
+    __slots__ = ("client_cookies", "injected_scripts", "overlays", "error", "debug_log")
+
+    def __init__(self):
+        super().__init__()
+        self.client_cookies: List[str] = []
+        self.injected_scripts: List[str] = []
+        self.overlays: List[str] = []
+        self.error: Optional[str] = None
+        self.debug_log: List[str] = []
+
+
+class AlignmentResult:
+    __slots__ = ("alignment_percent", "shared_terms", "missing_terms", "total_sd_terms")
+
+    def __init__(self, alignment_percent: float, shared_terms: List[str], missing_terms: List[str], total_sd_terms: int):
+        self.alignment_percent = alignment_percent
+        self.shared_terms = shared_terms
+        self.missing_terms = missing_terms
+        self.total_sd_terms = total_sd_terms
+
+
+class PageSummary:
+    __slots__ = (
+        "url", "status", "load_time_ms", "backlink_required", "backlink_found",
+        "backlink_score", "alignment_percent", "structured_data_present", "violations",
+    )
+
+    def __init__(
+        self,
+        url: str,
+        status: str,
+        violations: Tuple[Violation, ...] = (),
+        load_time_ms: Optional[int] = None,
+        backlink_required: Optional[bool] = None,
+        backlink_found: Optional[bool] = None,
+        backlink_score: Optional[int] = None,
+        alignment_percent: Optional[float] = None,
+        structured_data_present: bool = False,
+    ):
+        self.url = url
+        self.status = status
+        self.violations = violations
+        self.load_time_ms = load_time_ms
+        self.backlink_required = backlink_required
+        self.backlink_found = backlink_found
+        self.backlink_score = backlink_score
+        self.alignment_percent = alignment_percent
+        self.structured_data_present = structured_data_present
+
+    def violation_lines(self) -> List[str]:
+        return [v.format() for v in self.violations]
+
+    def to_dict(self) -> Dict:
+        data = {name: getattr(self, name) for name in self.__slots__}
+        data["violations"] = [v.to_dict() for v in self.violations]
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "PageSummary":
+        fields = {name: data.get(name) for name in cls.__slots__ if name != "violations"}
+        fields["structured_data_present"] = bool(fields["structured_data_present"])
+        return cls(violations=tuple(Violation.from_dict(v) for v in data.get("violations", [])), **fields)
@@ -0,0 +1,251 @@
+# structuredweb_auditor/rules/rendered_zero_trust.py
+
+import atexit
+import queue
+import threading
+import zlib
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from typing import Iterable, Optional
+from urllib.parse import urljoin, urlparse
+
+from config import (
+    RENDER_MODE, RENDER_POOL_SIZE, RENDER_SAMPLE_RATE, RENDER_SETTLE_MS, RENDER_TIMEOUT_MS,
+    RENDER_WAIT_MARGIN_MS, USER_AGENT,
+)
+from core.records import RenderedPage, RenderedResult
+from core.urls import canonical_path
+from rules.zero_trust import EDGE_WHITELIST
+
+# Static zero-trust only sees the HTML the server sent. This rule loads the
+# page in a headless browser to catch what scripts do afterwards: cookies
+# written through document.cookie, scripts injected at runtime and overlays
+# that are only visible once rendered.
+
+BLOCKED_RESOURCES = {"image", "font", "media"}
+BROWSER_UNAVAILABLE = "headless browser unavailable"
+
+# Installed before any page script runs; records every document.cookie write
+COOKIE_SPY = """
+(() => {
+  const desc = Object.getOwnPropertyDescriptor(Document.prototype, 'cookie');
+  if (!desc || !desc.set) return;
+  window.__swaCookieWrites = [];
+  Object.defineProperty(Document.prototype, 'cookie', {
+    configurable: true,
+    get() { return desc.get.call(this); },
+    set(value) {
+      window.__swaCookieWrites.push(String(value).split(';')[0].trim());
+      desc.set.call(this, value);
+    },
+  });
+})();
+"""
+
+# Visible dialogs, plus fixed/sticky elements covering a quarter of the viewport
+OVERLAY_PROBE = """
+() => {
+  const vw = window.innerWidth, vh = window.innerHeight, found = [];
+  const describe = (el) => el.tagName.toLowerCase()
+    + (el.id ? '#' + el.id : '')
+    + (typeof el.className === 'string' && el.className.trim() ? '.' + el.className.trim().split(/\\s+/).join('.') : '');
+  for (const el of document.querySelectorAll('body *')) {
+    const modal = el.matches('dialog[open], [role="dialog"], [role="alertdialog"], [aria-modal="true"]');
+    const style = getComputedStyle(el);
+    if (!modal && style.position !== 'fixed' && style.position !== 'sticky') continue;
+    if (style.display === 'none' || style.visibility === 'hidden' || parseFloat(style.opacity) === 0) continue;
+    const r = el.getBoundingClientRect();
+    const area = Math.max(0, Math.min(r.right, vw) - Math.max(r.left, 0))
+               * Math.max(0, Math.min(r.bottom, vh) - Math.max(r.top, 0));
+    if (area >= 0.25 * vw * vh || (modal && area > 0)) found.push(describe(el));
+    if (found.length >= 10) break;
+  }
+  return found;
+}
+"""
+
+def should_render(url: str, static_failed: bool, mode: str = RENDER_MODE, sample_rate: float = RENDER_SAMPLE_RATE) -> bool:
+    if mode == "all":
+        return True
+    if mode == "failing":
+        return static_failed
+    if mode == "sample":
+        # Hash-based so every worker samples the same pages
+        return zlib.crc32(url.encode("utf-8")) % 10000 < sample_rate * 10000
+    return False
+
+
+class BrowserPool:
+    # Playwright's sync API is bound to the thread that started it, so each
+    # slot is a thread owning one browser and one long-lived context. Audits
+    # from any thread queue up and are served by whichever slot is free.
+
+    def __init__(self, size: int = RENDER_POOL_SIZE, timeout_ms: int = RENDER_TIMEOUT_MS,
+                 settle_ms: int = RENDER_SETTLE_MS, wait_margin_ms: int = RENDER_WAIT_MARGIN_MS):
+        self.timeout_ms = timeout_ms
+        self.settle_ms = settle_ms
+        self.wait_seconds = (timeout_ms + settle_ms + wait_margin_ms) / 1000
+        self._tasks: "queue.Queue" = queue.Queue()
+        self._threads = []
+        for _ in range(size):
+            self._add_slot()
+
+    def _add_slot(self):
+        thread = threading.Thread(target=self._slot, name=f"swa-browser-{len(self._threads)}", daemon=True)
+        self._threads.append(thread)
+        thread.start()
+
+    def submit(self, url: str) -> Future:
+        future: Future = Future()
+        self._tasks.put((future, url))
+        return future
+
+    def result(self, future: Future) -> RenderedPage:
+        # Waits at most one render's worth, so a hung tab can't stall the audit.
+        # Playwright calls can't be interrupted from another thread: a slot
+        # stuck past the wait is abandoned and a fresh slot takes its place.
+        try:
+            return future.result(timeout=self.wait_seconds)
+        except FutureTimeout:
+            if future.cancel():
+                return RenderedPage(error=f"render timed out after {self.wait_seconds:.0f} s waiting for a browser")
+            self._add_slot()
+            return RenderedPage(error=f"render timed out after {self.wait_seconds:.0f} s")
+
+    def close(self):
+        for _ in self._threads:
+            self._tasks.put(None)
+        for thread in self._threads:
+            thread.join(timeout=10)
+
+    def _new_context(self, browser):
+        context = browser.new_context(user_agent=USER_AGENT, service_workers="block")
+        context.route(
+            "**/*",
+            lambda route: route.abort() if route.request.resource_type in BLOCKED_RESOURCES else route.continue_(),
+        )
+        context.add_init_script(COOKIE_SPY)
+        return context
+
+    def _render(self, context, url: str) -> RenderedPage:
+        context.clear_cookies()
+        page = context.new_page()
+        script_urls = []
+        page.on("request", lambda request: script_urls.append(request.url) if request.resource_type == "script" else None)
+        try:
+            page.goto(url, wait_until="load", timeout=self.timeout_ms)
+            page.wait_for_timeout(self.settle_ms)
+            return RenderedPage(
+                cookie_writes=page.evaluate("() => window.__swaCookieWrites || []"),
+                script_urls=script_urls,
+                overlays=page.evaluate(OVERLAY_PROBE),
+            )
+        finally:
+            page.close()
+
+    def _slot(self):
+        playwright = browser = context = None
+        startup_error = None
+        try:
+            from playwright.sync_api import sync_playwright
+            playwright = sync_playwright().start()
+            browser = playwright.chromium.launch(headless=True)
+        except Exception as e:
+            startup_error = f"{BROWSER_UNAVAILABLE}: {str(e).strip().splitlines()[0]}"
+
+        while True:
+            task = self._tasks.get()
+            if task is None:
+                break
+            future, url = task
+            if not future.set_running_or_notify_cancel():
+                continue
+            if startup_error:
+                future.set_result(RenderedPage(error=startup_error))
+                continue
+            try:
+                if context is None:
+                    context = self._new_context(browser)
+                future.set_result(self._render(context, url))
+            except Exception as e:
+                # Don't reuse a context that just failed; the next page gets a fresh one
+                try:
+                    context.close()
+                except Exception:
+                    pass
+                context = None
+                future.set_result(RenderedPage(error=str(e)))
+
+        for closeable in (context, browser):
+            try:
+                if closeable is not None:
+                    closeable.close()
+            except Exception:
+                pass
+        if playwright is not None:
+            playwright.stop()
+
+
+_pool: Optional[BrowserPool] = None
+_pool_lock = threading.Lock()
+
+def get_browser_pool() -> BrowserPool:
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = BrowserPool()
+                atexit.register(_pool.close)
+    return _pool
+
+def submit_render(url: str) -> Future:
+    return get_browser_pool().submit(url)
+
+def render_result(future: Future) -> RenderedPage:
+    return get_browser_pool().result(future)
+
+def audit_rendered_zero_trust(url: str, rendered: RenderedPage, static_scripts: Iterable[str] = ()) -> RenderedResult:
+    # static_scripts: script srcs already present in the server HTML (and so
+    # already judged by the static rule); anything else fetched is injected.
+    result = RenderedResult()
+    debug_log = result.debug_log
+    debug_log.append(f"🔍 Rendered Zero Trust Audit: {url}")
+
+    if rendered.error:
+        result.error = rendered.error
+        debug_log.append(f"⚠️ Rendered audit skipped: {rendered.error}")
+        return result
+
+    parsed = urlparse(url)
+    is_homepage = canonical_path(parsed.path) == "/"
+
+    static = {urljoin(url, src) for src in static_scripts}
+    for src in dict.fromkeys(rendered.script_urls):
+        if src not in static and not any(allowed in src for allowed in EDGE_WHITELIST):
+            result.injected_scripts.append(src)
+    result.client_cookies = list(dict.fromkeys(rendered.cookie_writes))
+    result.overlays = list(rendered.overlays)
+
+    debug_log.append(
+        f"✘ Scripts injected at runtime: {result.injected_scripts}" if result.injected_scripts
+        else "✓ No scripts injected at runtime"
+    )
+    debug_log.append(
+        f"✘ Cookies written by page scripts: {result.client_cookies}" if result.client_cookies
+        else "✓ No cookies written by page scripts"
+    )
+    debug_log.append(
+        f"✘ Visible overlays after render: {result.overlays}" if result.overlays
+        else "✓ No visible overlay after render"
+    )
+
+    # Enforcement (non-homepage only), as in the static rule
+    if not is_homepage:
+        if result.injected_scripts:
+            result.fail("rendered_scripts", tuple(result.injected_scripts))
+        if result.client_cookies:
+            result.fail("rendered_cookies", tuple(result.client_cookies))
+        if result.overlays:
+            result.fail("rendered_overlay", tuple(result.overlays))
+
+    debug_log.append(f"→ Rendered Status: {result.status}")
+    return result
@@ -4,10 +4,12 @@ import os
 import json
 from typing import Dict, List
 
+from core.records import AlignmentResult, PageSummary, SchemaResult
+
 OUTPUT_DIR = "outputs/pages"
 RAW_SCHEMA_DIR = "outputs/pages/raw_schema"
 
-def write_page_report(slug: str, final_url: str, summary: Dict, schema: Dict, alignment: Dict, debug_logs: List[str] = None):
+def write_page_report(slug: str, final_url: str, summary: PageSummary, schema: SchemaResult, alignment: AlignmentResult, debug_logs: List[str] = None):
     os.makedirs(OUTPUT_DIR, exist_ok=True)
     os.makedirs(RAW_SCHEMA_DIR, exist_ok=True)
 
@@ -15,40 +17,62 @@ def write_page_report(slug: str, final_url: str, summary: Dict, schema: Dict, al
     with open(report_path, "w", encoding="utf-8") as f:
         f.write(f"URL: {final_url}\n")
         f.write("Raw JSON-LD:\n")
-        f.write(json.dumps(schema["json_ld_data"], indent=2, ensure_ascii=False))
+        f.write(json.dumps(schema.json_ld_data, indent=2, ensure_ascii=False))
 
         f.write("\n\n--- AUDIT SUMMARY ---\n")
-        f.write(f"Status: {summary['status']}\n")
-        f.write(f"Load time: {summary['load_time_ms']} ms\n")
-        f.write(f"Backlink required: {summary['backlink_required']}\n")
-        f.write(f"Backlink found: {summary['backlink_found']}\n")
-        f.write(f"Alignment %: {summary['alignment_percent']}%\n")
-        f.write(f"Structured data present (JSON-LD): {summary['structured_data_present']}\n\n")
+        f.write(f"Status: {summary.status}\n")
+        f.write(f"Load time: {summary.load_time_ms} ms\n")
+        f.write(f"Backlink required: {summary.backlink_required}\n")
+        f.write(f"Backlink found: {summary.backlink_found}\n")
+        f.write(f"Alignment %: {summary.alignment_percent}%\n")
+        f.write(f"Structured data present (JSON-LD): {summary.structured_data_present}\n\n")
 
         f.write("Violations:\n")
-        if summary["violations"]:
-            for v in summary["violations"]:
-                f.write(f"- {v}\n")
+        if summary.violations:
+            for line in summary.violation_lines():
+                f.write(f"- {line}\n")
         else:
             f.write("None\n")
 
         f.write("\nSemantic Terms (shared):\n")
-        for term in alignment.get("shared_terms", []):
+        for term in alignment.shared_terms:
             f.write(f"✔ {term}\n")
 
         f.write("\nSemantic Terms (missing):\n")
-        for term in alignment.get("missing_terms", []):
+        for term in alignment.missing_terms:
             f.write(f"✘ {term}\n")
 
         f.write("\nRaw Microdata:\n")
-        for md in schema["microdata_data"]:
-            f.write(md.get("html", "") + "\n")
+        for html in schema.microdata_html:
+            f.write(html + "\n")
 
         if debug_logs:
             f.write("\n--- Zero Trust Debug ---\n")
             for line in debug_logs:
                 f.write(line + "\n")
 
+def format_summary(summary: PageSummary) -> str:
+    def or_na(value):
+        return "n/a" if value is None else value
+
+    lines = [
+        "=" * 60,
+        f"🧾 Audit Complete: {summary.url}",
+        f"Status: {summary.status}",
+        f"Load time: {or_na(summary.load_time_ms)} ms",
+        f"Backlink required: {or_na(summary.backlink_required)}",
+        f"Backlink found: {or_na(summary.backlink_found)}",
+        f"Structured Data: {summary.structured_data_present}",
+        f"Alignment Score: {0 if summary.alignment_percent is None else summary.alignment_percent}%",
+        "\nViolations:",
+    ]
+    if summary.violations:
+        lines.extend(f" - {line}" for line in summary.violation_lines())
+    else:
+        lines.append("None ✅")
+    lines.append("=" * 60)
+    return "\n".join(lines)
+
 def write_raw_schema(slug: str, json_ld_data: List[Dict]):
     os.makedirs(RAW_SCHEMA_DIR, exist_ok=True)
     json_path = os.path.join(RAW_SCHEMA_DIR, f"{slug}.json")
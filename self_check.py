@@ -0,0 +1,181 @@
+# structuredweb_auditor/tools/self_check.py
+
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import threading
+import time
+import traceback
+from typing import Callable, List, Tuple
+
+# The rendered check audits every fixture page in the browser; config reads
+# this once at import, so it has to be set before anything loads config.
+os.environ["SWA_RENDER"] = "all"
+
+RENDERED_FIXTURES = os.path.abspath(os.path.join("fixtures", "rendered"))
+# Rendered violations each fixture page must produce, and no others
+RENDERED_EXPECTED = {
+    "/clean.html": set(),
+    "/client-cookie.html": {"rendered_cookies"},
+    "/injected-script.html": {"rendered_scripts"},
+    "/late-overlay.html": {"rendered_overlay"},
+}
+
+CORPUS_FIXTURES = os.path.abspath(os.path.join("fixtures", "corpus"))
+DISTRIBUTED_PATHS = ("/", "/verify.html", "/large.html", "/microdata.html", "/graph.html")
+
+# Quick end-to-end checks for behaviour the rule corpus (rule_bench.py) does
+# not cover. Each check raises AssertionError on failure, or SkipCheck when
+# something it needs is not installed.
+#
+# Run from the project root:
+#   python -m tools.self_check
+
+class SkipCheck(Exception):
+    pass
+
+@contextlib.contextmanager
+def _scratch_dir():
+    # Reports and queue files go into a temporary directory, not into the repo
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        try:
+            yield workdir
+        finally:
+            os.chdir(cwd)
+
+def _sqlite_queue(workdir: str):
+    from core.work_queue import SQLiteWorkQueue
+    return SQLiteWorkQueue(os.path.join(workdir, "queue.db"))
+
+def _local_queue(workdir: str):
+    from core.work_queue import open_queue
+    return open_queue("local://")
+
+def check_score_clamps_with_large_weights():
+    # backlink_score is stored narrow; heavy re-scoring weights must not wrap
+    from core.meta_score import ScoreWeights, compute_page_score
+    from core.records import PageSummary
+
+    page = PageSummary(
+        "https://example.org/verify.html", "PASS",
+        backlink_score=0, structured_data_present=True, alignment_percent=100, load_time_ms=10,
+    )
+    for point in (13, 15, 100):
+        score = compute_page_score(page, ScoreWeights(backlink_point=point, backlink_max=10))
+        assert score == 0, f"backlink_point={point}: expected 0, got {score}"
+    assert compute_page_score(page) == 80, f"default weights: expected 80, got {compute_page_score(page)}"
+
+def check_rendered_fixtures():
+    # Runs the full audit_page pipeline against fixtures/rendered in Chromium
+    try:
+        import playwright  # noqa: F401
+    except ImportError:
+        raise SkipCheck("playwright not installed")
+    from core.audit_runner import audit_page
+    from rules.rendered_zero_trust import BROWSER_UNAVAILABLE, submit_render
+    from tools.fixture_server import start_fixture_server
+
+    server, base_url = start_fixture_server(RENDERED_FIXTURES)
+    try:
+        probe = submit_render(base_url + "/clean.html").result(timeout=120)
+        if probe.error and probe.error.startswith(BROWSER_UNAVAILABLE):
+            raise SkipCheck(probe.error)
+
+        with _scratch_dir():
+            for path, expected in RENDERED_EXPECTED.items():
+                summary = audit_page(base_url + path)
+                found = {v.code for v in summary.violations if v.code.startswith("rendered_")}
+                assert found == expected, f"{path}: expected {sorted(expected)}, got {sorted(found)}"
+    finally:
+        server.shutdown()
+
+def check_distributed_run(make_queue: Callable):
+    # A coordinator and two worker threads audit fixture pages over the queue
+    from core.distributed import run_coordinator, run_worker
+    from tools.fixture_server import start_fixture_server
+
+    server, base_url = start_fixture_server(CORPUS_FIXTURES)
+    urls = [base_url + path for path in DISTRIBUTED_PATHS]
+    try:
+        with _scratch_dir() as workdir, contextlib.redirect_stdout(io.StringIO()):
+            queue = make_queue(workdir)
+            audited = []
+            workers = [
+                threading.Thread(target=lambda n=n: audited.append(run_worker(queue, f"worker-{n}", poll_seconds=0.05)))
+                for n in (1, 2)
+            ]
+            for worker in workers:
+                worker.start()
+            summaries = run_coordinator(queue, urls, report_name="self-check", poll_seconds=0.05, max_urls=2)
+            for worker in workers:
+                worker.join(timeout=60)
+    finally:
+        server.shutdown()
+
+    assert not any(worker.is_alive() for worker in workers), "a worker did not stop after the run finished"
+    assert [s and s.url for s in summaries] == urls, f"expected summaries for {urls}, got {[s and s.url for s in summaries]}"
+    assert sum(audited) == len(urls), f"expected {len(urls)} pages audited once, workers audited {audited}"
+
+def check_lease_ownership(make_queue: Callable):
+    # Expired leases move to another worker; only the current holder in the
+    # current run may renew or complete a shard
+    with _scratch_dir() as workdir:
+        queue = make_queue(workdir)
+        queue.reset()
+        queue.put_shards([("a.example", ["https://a.example/"])])
+
+        first = queue.lease("w1", 0.5)
+        assert first is not None, "no shard leased"
+        assert queue.lease("w2", 30) is None, "a leased shard was handed out twice"
+        assert not queue.renew(first.id, "w2", 30), "non-owner renewed the shard"
+        assert not queue.complete(first.id, "w2", [{}]), "non-owner completed the shard"
+
+        time.sleep(0.6)
+        second = queue.lease("w2", 30)
+        assert second is not None and second.id == first.id, "expired lease was not reassigned"
+        assert not queue.renew(first.id, "w1", 30), "expired owner renewed the reassigned shard"
+        assert not queue.complete(first.id, "w1", [{}]), "expired owner completed the reassigned shard"
+        assert queue.complete(second.id, "w2", [{}]), "new owner could not complete the shard"
+        assert queue.finished(), "run not finished after its only shard completed"
+
+        queue.reset()
+        queue.put_shards([("a.example", ["https://a.example/"])])
+        current = queue.lease("w1", 30)
+        assert current is not None and current.id != first.id, "new run reused the previous run's shard id"
+        assert not queue.renew(first.id, "w2", 30), "shard from the previous run was renewed"
+        assert not queue.complete(first.id, "w2", [{}]), "shard from the previous run was completed"
+        assert queue.complete(current.id, "w1", [{}]), "current shard could not be completed"
+        assert list(queue.results()) == [current.id], f"unexpected results {list(queue.results())}"
+
+CHECKS: List[Tuple[str, Callable]] = [
+    ("score clamps with large weights", check_score_clamps_with_large_weights),
+    ("rendered zero-trust on fixtures/rendered", check_rendered_fixtures),
+    ("distributed run on a SQLite queue", lambda: check_distributed_run(_sqlite_queue)),
+    ("distributed run on a local:// queue", lambda: check_distributed_run(_local_queue)),
+    ("lease ownership on a SQLite queue", lambda: check_lease_ownership(_sqlite_queue)),
+    ("lease ownership on a local:// queue", lambda: check_lease_ownership(_local_queue)),
+]
+
+def main():
+    failed = 0
+    for name, check in CHECKS:
+        try:
+            check()
+            print(f"  ✔ {name}")
+        except SkipCheck as e:
+            print(f"  - {name}: skipped ({e})")
+        except Exception:
+            failed += 1
+            print(f"  ✘ {name}")
+            traceback.print_exc()
+    if failed:
+        print(f"\n❌ {failed} check(s) failed.")
+        sys.exit(1)
+    print("\n✅ All checks passed.")
+
+if __name__ == "__main__":
+    main()
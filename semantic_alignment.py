@@ -1,8 +1,10 @@
 # structuredweb_auditor/rules/semantic_alignment.py
 
 import re
-from bs4 import BeautifulSoup
-from typing import List, Dict
+from typing import List, Optional
+
+from core.jsonld_index import JsonLdIndex
+from core.records import AlignmentResult, MicrodataItem
 
 # Common and domain-specific noise terms to skip
 STOPWORDS = set([
@@ -24,34 +26,26 @@ def extract_keywords(text: str) -> List[str]:
     return [word for word in words if word not in STOPWORDS]
 
 
-def extract_json_ld_keywords(json_ld_blocks: List[dict]) -> List[str]:
-    descriptions = []
+def extract_json_ld_keywords(json_ld_blocks: List[dict], index: Optional[JsonLdIndex] = None) -> List[str]:
+    if index is None:
+        index = JsonLdIndex(json_ld_blocks)
 
-    def extract_desc(obj):
-        if isinstance(obj, dict):
-            for k, v in obj.items():
-                if "description" in k.lower() or "keywords" in k.lower():
-                    if isinstance(v, str):
-                        descriptions.append(v)
-                    elif isinstance(v, list):
-                        descriptions.extend([str(i) for i in v])
-                elif isinstance(v, (dict, list)):
-                    extract_desc(v)
-        elif isinstance(obj, list):
-            for item in obj:
-                extract_desc(item)
-
-    for block in json_ld_blocks:
-        extract_desc(block)
+    descriptions = []
+    for key in index.props:
+        if "description" in key or "keywords" in key:
+            for v in index.get(key):
+                if isinstance(v, str):
+                    descriptions.append(v)
+                elif isinstance(v, list):
+                    descriptions.extend([str(i) for i in v])
 
     return extract_keywords(" ".join(descriptions))
 
 
-def extract_microdata_keywords(microdata_items: List[dict]) -> List[str]:
+def extract_microdata_keywords(microdata_items: List[MicrodataItem]) -> List[str]:
     desc_texts = []
     for item in microdata_items:
-        props = item.get("props", {})
-        for key, val in props.items():
+        for key, val in item.props.items():
             if "description" in key.lower() and isinstance(val, str):
                 desc_texts.append(val)
     return extract_keywords(" ".join(desc_texts))
@@ -60,25 +54,28 @@ def extract_microdata_keywords(microdata_items: List[dict]) -> List[str]:
 def audit_semantic_alignment(
     html: str,
     json_ld_blocks: List[dict],
-    microdata_items: List[dict]
-) -> Dict:
+    microdata_items: List[MicrodataItem],
+    json_ld_index: Optional[JsonLdIndex] = None
+) -> AlignmentResult:
+    from bs4 import BeautifulSoup
+
     soup = BeautifulSoup(html, "html.parser")
     html_text = soup.get_text(separator=" ", strip=True)
     html_keywords = set(extract_keywords(html_text))
 
-    json_keywords = set(extract_json_ld_keywords(json_ld_blocks))
-    micro_keywords = set(extract_microdata_keywords(microdata_items))
-
-    sd_keywords = json_keywords.union(micro_keywords)
-    shared = sd_keywords.intersection(html_keywords)
-
-    alignment_percent = (
-        round(len(shared) / len(sd_keywords) * 100, 2) if sd_keywords else 0
-    )
-
-    return {
-        "alignment_percent": alignment_percent,
-        "shared_terms": sorted(list(shared)),
-        "missing_terms": sorted(list(sd_keywords - html_keywords)),
-        "total_sd_terms": len(sd_keywords)
-    }
+    json_keywords = set(extract_json_ld_keywords(json_ld_blocks, json_ld_index))
+    micro_keywords = set(extract_microdata_keywords(microdata_items))
+
+    sd_keywords = json_keywords.union(micro_keywords)
+    shared = sd_keywords.intersection(html_keywords)
+
+    alignment_percent = (
+        round(len(shared) / len(sd_keywords) * 100, 2) if sd_keywords else 0
+    )
+
+    return AlignmentResult(
+        alignment_percent=alignment_percent,
+        shared_terms=sorted(list(shared)),
+        missing_terms=sorted(list(sd_keywords - html_keywords)),
+        total_sd_terms=len(sd_keywords)
+    )
@@ -0,0 +1,462 @@
+# structuredweb_auditor/core/service.py
+
+import itertools
+import json
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from config import (
+    SERVICE_HOST, SERVICE_PORT, SERVICE_WORKERS, SERVICE_JOB_RUNNERS, SERVICE_MAX_FINISHED_JOBS,
+)
+from core.records import PageSummary, Violation
+from core.telemetry import CrawlTelemetry
+from core.urls import canonical_url, dedupe_urls, is_hostname
+
+JOB_KINDS = ("url", "urls", "sitemap", "mesh")
+SHUTDOWN_ERROR = "Service shut down before the job finished."
+
+def parse_job_spec(spec: Dict) -> Tuple[str, tuple, Dict]:
+    # Returns (kind, dedupe key, normalized params); raises ValueError on bad input
+    if not isinstance(spec, dict):
+        raise ValueError("Job must be a JSON object.")
+    kind = spec.get("kind")
+
+    if kind == "url":
+        url = spec.get("url")
+        if not isinstance(url, str) or not url.strip():
+            raise ValueError("'url' jobs need a 'url' string.")
+        url = url.strip()
+        return kind, (kind, canonical_url(url)), {"url": url}
+
+    if kind == "urls":
+        urls = spec.get("urls")
+        if not isinstance(urls, list) or not urls or not all(isinstance(u, str) for u in urls):
+            raise ValueError("'urls' jobs need a non-empty 'urls' list of strings.")
+        urls = dedupe_urls(urls)
+        return kind, (kind, tuple(canonical_url(u) for u in urls)), {"urls": urls}
+
+    if kind == "sitemap":
+        domain = spec.get("domain")
+        if not isinstance(domain, str) or not domain.strip():
+            raise ValueError("'sitemap' jobs need a 'domain' string.")
+        domain = domain.strip().lower()
+        if not is_hostname(domain):
+            raise ValueError("'domain' must be a bare host name, e.g. example.org.")
+        return kind, (kind, domain), {"domain": domain}
+
+    if kind == "mesh":
+        return kind, (kind,), {}
+
+    raise ValueError(f"Unknown job kind {kind!r}; expected one of {', '.join(JOB_KINDS)}.")
+
+
+class Job:
+    __slots__ = ("id", "kind", "key", "params", "status", "error", "total", "results",
+                 "report", "created", "finished", "_cond")
+
+    def __init__(self, job_id: str, kind: str, key: tuple, params: Dict):
+        self.id = job_id
+        self.kind = kind
+        self.key = key
+        self.params = params
+        self.status = "queued"
+        self.error: Optional[str] = None
+        self.total: Optional[int] = None
+        self.results: List[Tuple[int, PageSummary]] = []  # (position in job, summary), in completion order
+        self.report: Optional[str] = None
+        self.created = time.time()
+        self.finished: Optional[float] = None
+        self._cond = threading.Condition()
+
+    @property
+    def done(self) -> bool:
+        return self.status in ("done", "failed")
+
+    def _update(self, **changes):
+        with self._cond:
+            for name, value in changes.items():
+                setattr(self, name, value)
+            self._cond.notify_all()
+
+    def start(self) -> bool:
+        # False if the job was cancelled before a runner picked it up
+        with self._cond:
+            if self.done:
+                return False
+            self.status = "running"
+            self._cond.notify_all()
+            return True
+
+    def cancel(self, error: str):
+        # Fails the job if no runner has started it yet
+        with self._cond:
+            if self.status == "queued":
+                self.status, self.error, self.finished = "failed", error, time.time()
+                self._cond.notify_all()
+
+    def set_total(self, total: int):
+        self._update(total=total)
+
+    def add_result(self, index: int, summary: PageSummary) -> bool:
+        # True once every page of the job has a result
+        with self._cond:
+            if self.done:
+                return False
+            self.results.append((index, summary))
+            self._cond.notify_all()
+            return len(self.results) == self.total
+
+    def finish(self, error: Optional[str] = None, report: Optional[str] = None):
+        with self._cond:
+            if not self.done:
+                self._update(status="failed" if error else "done", error=error, report=report, finished=time.time())
+
+    def wait_for(self, seen: int, timeout: float) -> Tuple[List[Tuple[int, PageSummary]], bool]:
+        # Blocks until results beyond `seen` arrive or the job ends; returns (new results, done)
+        with self._cond:
+            self._cond.wait_for(lambda: len(self.results) > seen or self.done, timeout)
+            return self.results[seen:], self.done
+
+    def to_dict(self, since: Optional[int] = None) -> Dict:
+        with self._cond:
+            data = {
+                "id": self.id,
+                "kind": self.kind,
+                "params": self.params,
+                "status": self.status,
+                "error": self.error,
+                "total": self.total,
+                "completed": len(self.results),
+                "report": self.report,
+                "created": self.created,
+                "finished": self.finished,
+            }
+            if since is not None:
+                data["results"] = [dict(s.to_dict(), index=i) for i, s in self.results[since:]]
+                data["next"] = len(self.results)
+        return data
+
+
+class FairPagePool:
+    # Page workers that take the next page from each job in turn, so a one-URL
+    # job isn't queued behind every page of a mesh job submitted before it.
+
+    def __init__(self, workers: int):
+        self._queues: "OrderedDict[str, deque]" = OrderedDict()
+        self._cond = threading.Condition()
+        self._stopped = False
+        for n in range(workers):
+            threading.Thread(target=self._work, name=f"swa-page-{n}").start()
+
+    def submit(self, owner: str, fn: Callable, *args) -> Future:
+        future = Future()
+        with self._cond:
+            if self._stopped:
+                raise RuntimeError(SHUTDOWN_ERROR)
+            self._queues.setdefault(owner, deque()).append((future, fn, args))
+            self._cond.notify()
+        return future
+
+    def shutdown(self):
+        # Pages being audited finish; queued pages are cancelled
+        with self._cond:
+            self._stopped = True
+            queued = [future for queue in self._queues.values() for future, _, _ in queue]
+            self._queues.clear()
+            self._cond.notify_all()
+        for future in queued:
+            future.cancel()
+
+    def _next(self) -> Optional[tuple]:
+        with self._cond:
+            self._cond.wait_for(lambda: self._queues or self._stopped)
+            if self._stopped:
+                return None
+            owner, queue = next(iter(self._queues.items()))
+            item = queue.popleft()
+            if queue:
+                self._queues.move_to_end(owner)
+            else:
+                del self._queues[owner]
+            return item
+
+    def _work(self):
+        while True:
+            item = self._next()
+            if item is None:
+                return
+            future, fn, args = item
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                result = fn(*args)
+            except BaseException as e:
+                future.set_exception(e)
+            else:
+                future.set_result(result)
+
+
+class AuditService:
+    # Jobs wait on a small runner pool that expands them into URLs; pages from
+    # every job are audited on one shared FairPagePool, and each job completes
+    # when its last page does. A URL that is already queued or being audited
+    # is not audited again: later jobs share its result.
+
+    def __init__(self, workers: int = SERVICE_WORKERS, job_runners: int = SERVICE_JOB_RUNNERS,
+                 max_finished_jobs: int = SERVICE_MAX_FINISHED_JOBS):
+        self._pages = FairPagePool(workers)
+        self._runners = ThreadPoolExecutor(max_workers=job_runners, thread_name_prefix="swa-job")
+        self._max_finished_jobs = max_finished_jobs
+        self._lock = threading.RLock()
+        self._ids = itertools.count(1)
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._active: Dict[tuple, Job] = {}
+        self._inflight: Dict[str, Future] = {}
+        self.telemetry = CrawlTelemetry(live=False)
+
+    def submit(self, spec: Dict) -> Tuple[Job, bool]:
+        # Returns (job, deduplicated); an identical queued/running job is reused
+        kind, key, params = parse_job_spec(spec)
+        with self._lock:
+            job = self._active.get(key)
+            if job is not None:
+                return job, True
+            job = Job(str(next(self._ids)), kind, key, params)
+            self._jobs[job.id] = job
+            self._active[key] = job
+        self._runners.submit(self._run, job)
+        return job, False
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def jobs(self) -> List[Job]:
+        with self._lock:
+            return list(self._jobs.values())
+
+    def shutdown(self):
+        # Pages already being audited finish; queued pages and jobs are cancelled
+        # and their jobs fail, so Ctrl+C doesn't wait for the whole queue.
+        self._pages.shutdown()
+        for job in self.jobs():
+            job.cancel(SHUTDOWN_ERROR)
+        self._runners.shutdown(wait=False)
+
+    def _audit(self, job: Job, url: str) -> Future:
+        from core.audit_runner import audit_page
+
+        key = canonical_url(url)
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is None:
+                future = self._pages.submit(job.id, self._timed, audit_page, url)
+                self._inflight[key] = future
+                future.add_done_callback(lambda f, key=key: self._settle(key, f))
+            return future
+
+    def _timed(self, audit_page, url: str) -> PageSummary:
+        started = self.telemetry.page_started()
+        summary = None
+        try:
+            summary = audit_page(url)
+            return summary
+        finally:
+            self.telemetry.page_finished(url, summary, started)
+
+    def _settle(self, key: str, future: Future):
+        with self._lock:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+    def _expand(self, job: Job) -> List[str]:
+        from core.discovery import collect_mesh_urls, parse_sitemap
+
+        if job.kind == "url":
+            urls = [job.params["url"]]
+        elif job.kind == "urls":
+            urls = job.params["urls"]
+        elif job.kind == "sitemap":
+            urls = parse_sitemap(f"https://{job.params['domain']}/sitemap.xml")
+        else:
+            urls = collect_mesh_urls()
+        return dedupe_urls(urls)
+
+    def _run(self, job: Job):
+        # Expands the job and queues its pages; the runner is free again once
+        # they are queued, and the job's last page to finish completes it.
+        if not job.start():
+            return
+        try:
+            urls = self._expand(job)
+            job.set_total(len(urls))
+            if not urls:
+                raise ValueError("No URLs found to audit.")
+
+            summaries: List[Optional[PageSummary]] = [None] * len(urls)
+            for i, url in enumerate(urls):
+                self._audit(job, url).add_done_callback(
+                    lambda future, i=i, url=url: self._collect(job, summaries, i, url, future)
+                )
+        except Exception as e:
+            self._finish(job, error=str(e))
+
+    def _collect(self, job: Job, summaries: List[Optional[PageSummary]], i: int, url: str, future: Future):
+        if future.cancelled():
+            self._finish(job, error=SHUTDOWN_ERROR)
+            return
+        try:
+            summary = future.result()
+        except Exception as e:
+            summary = PageSummary(url, "FAIL", violations=(Violation("audit_error", str(e)),))
+        summaries[i] = summary
+        if not job.add_result(i, summary):
+            return
+
+        error = None
+        report = None
+        try:
+            if job.kind in ("sitemap", "mesh"):
+                from core.discovery import MESH_REPORT_NAME
+                from core.site_report import SITES_DIR, write_combined_report
+                name = job.params["domain"] if job.kind == "sitemap" else MESH_REPORT_NAME
+                write_combined_report(name, summaries)
+                report = os.path.join(SITES_DIR, f"{name}.txt")
+        except Exception as e:
+            error = str(e)
+        self._finish(job, error=error, report=report)
+
+    def _finish(self, job: Job, error: Optional[str] = None, report: Optional[str] = None):
+        # Stop deduplicating against this job before clients can see it finished
+        with self._lock:
+            if self._active.get(job.key) is job:
+                del self._active[job.key]
+        job.finish(error=error, report=report)
+        self._forget_old_jobs()
+
+    def _forget_old_jobs(self):
+        with self._lock:
+            finished = [job_id for job_id, job in self._jobs.items() if job.done]
+            for job_id in finished[:max(len(finished) - self._max_finished_jobs, 0)]:
+                del self._jobs[job_id]
+
+
+class ServiceHandler(BaseHTTPRequestHandler):
+    # GET  /health                  liveness
+    # GET  /metrics                 Prometheus text: throughput, errors, per-host latency
+    # GET  /jobs                    all known jobs, without results
+    # POST /jobs                    {"kind": "url"|"urls"|"sitemap"|"mesh", ...} → 202
+    # GET  /jobs/<id>?since=N       job state plus results from position N onwards
+    # GET  /jobs/<id>/stream        NDJSON: one line per page result, then an "end" line
+    server_version = "StructuredWebAuditor/1.0"
+
+    @property
+    def service(self) -> AuditService:
+        return self.server.service
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status: int, data: Dict):
+        body = json.dumps(data, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        if urlparse(self.path).path.rstrip("/") != "/jobs":
+            self._send_json(404, {"error": "Not found."})
+            return
+        # Browsers send cross-origin text/plain POSTs without a preflight; only
+        # a JSON body marked as such can come from a real client.
+        if self.headers.get_content_type() != "application/json":
+            self._send_json(415, {"error": "POST /jobs needs Content-Type: application/json."})
+            return
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+            spec = json.loads(self.rfile.read(length) or b"{}")
+            job, deduplicated = self.service.submit(spec)
+        except ValueError as e:
+            self._send_json(400, {"error": str(e)})
+            return
+        self._send_json(202, {"job": job.to_dict(), "deduplicated": deduplicated})
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        parts = [p for p in parsed.path.split("/") if p]
+
+        if parts == ["health"]:
+            self._send_json(200, {"status": "ok", "jobs": len(self.service.jobs())})
+        elif parts == ["metrics"]:
+            body = self.service.telemetry.metrics_text().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        elif parts == ["jobs"]:
+            self._send_json(200, {"jobs": [job.to_dict() for job in self.service.jobs()]})
+        elif len(parts) in (2, 3) and parts[0] == "jobs":
+            job = self.service.get(parts[1])
+            if job is None:
+                self._send_json(404, {"error": f"Unknown job {parts[1]}."})
+            elif len(parts) == 2:
+                try:
+                    since = int(parse_qs(parsed.query).get("since", ["0"])[0])
+                except ValueError:
+                    self._send_json(400, {"error": "'since' must be an integer."})
+                    return
+                self._send_json(200, job.to_dict(since=max(since, 0)))
+            elif parts[2] == "stream":
+                self._stream(job)
+            else:
+                self._send_json(404, {"error": "Not found."})
+        else:
+            self._send_json(404, {"error": "Not found."})
+
+    def _stream(self, job: Job):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson; charset=utf-8")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+
+        seen = 0
+        while True:
+            batch, done = job.wait_for(seen, timeout=15)
+            for i, summary in batch:
+                line = dict(summary.to_dict(), index=i, event="result")
+                self.wfile.write(json.dumps(line, ensure_ascii=False).encode("utf-8") + b"\n")
+            seen += len(batch)
+            self.wfile.flush()
+            if done and not batch:
+                end = dict(job.to_dict(), event="end")
+                self.wfile.write(json.dumps(end, ensure_ascii=False).encode("utf-8") + b"\n")
+                return
+
+
+def serve(host: str = SERVICE_HOST, port: int = SERVICE_PORT):
+    import bs4  # noqa: F401 — load the parser backend before the first job
+    from core.audit_runner import audit_page  # noqa: F401
+    from core.http_client import get_session
+
+    get_session()
+    service = AuditService()
+    server = ThreadingHTTPServer((host, port), ServiceHandler)
+    server.daemon_threads = True
+    server.service = service
+    print(f"📡 Audit service listening on http://{host}:{port} (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.shutdown()
@@ -1,55 +1,33 @@
 # core/site_report.py
 
 import os
-from urllib.parse import urlparse
-from typing import List, Dict
+from typing import List
 from core.meta_score import compute_sitewide_score
+from core.page_table import PageTable
+from core.records import PageSummary
 
 SITES_DIR = "outputs/sites"
 
-def extract_path(url: str) -> str:
-    try:
-        parsed = urlparse(url)
-        path = parsed.path.rstrip("/") or "/"
-        return path
-    except:
-        return "/"
+def _or_na(value):
+    return "n/a" if value is None else value
 
-def write_combined_report(domain: str, page_reports: List[Dict]):
+def _or_zero(value):
+    return 0 if value is None else value
+
+def write_combined_report(domain: str, page_reports: List[PageSummary]):
     os.makedirs(SITES_DIR, exist_ok=True)
-    site_summary = compute_sitewide_score(page_reports)
+    table = PageTable.from_reports(page_reports)
+    site_summary = compute_sitewide_score(table)
     report_path = os.path.join(SITES_DIR, f"{domain}.txt")
 
-    verify_json_score = 0
-    verify_html_score = 0
-    home_score = 0
-
-    for r in page_reports:
-        path = extract_path(r.get("url", "").lower())
-        score = r.get("backlink_score")
-        if score is None:
-            continue
-        if path in ["/verify", "/verify.html"]:
-            verify_html_score = score
-        elif path == "/verify.json":
-            verify_json_score = score
-        elif path == "/":
-            home_score = score
+    # Keep the page facts so the run can be re-scored without re-auditing
+    table.save(os.path.join(SITES_DIR, f"{domain}.npz"))
 
-    total_backlink_score = (
-        min(verify_html_score, 2) +
-        min(verify_json_score, 1) +
-        min(home_score, 1)
-    )
-
-    if total_backlink_score == 4:
-        backlink_grade = "🟢 Perfect"
-    elif total_backlink_score == 3:
-        backlink_grade = "✅ Good Standing"
-    elif total_backlink_score == 2:
-        backlink_grade = "⚠ Needs Work"
-    else:
-        backlink_grade = "❌ Not Eligible"
+    verify_html_score = site_summary["verify_html_score"]
+    verify_json_score = site_summary["verify_json_score"]
+    home_score = site_summary["home_score"]
+    total_backlink_score = site_summary["total_backlink_score"]
+    backlink_grade = site_summary["backlink_grade"]
 
     with open(report_path, "w", encoding="utf-8") as f:
         f.write(f"📡 SITE REPORT — {domain}\n")
@@ -73,24 +51,18 @@ def write_combined_report(domain: str, page_reports: List[Dict]):
         f.write("\n\n--- AUDIT SUMMARIES ---\n")
         for i, report in enumerate(page_reports):
             f.write(f"\n--- Page {i + 1} ---\n")
-            f.write(f"URL: {report.get('url', 'n/a')}\n")
-            f.write(f"Status: {report.get('status')}\n")
-            f.write(f"Load time: {report.get('load_time_ms', 'n/a')} ms\n")
-            f.write(f"Backlink required: {report.get('backlink_required', 'n/a')}\n")
-            f.write(f"Backlink found: {report.get('backlink_found', 'n/a')}\n")
-            f.write(f"Structured Data: {report.get('structured_data_present', False)}\n")
-            f.write(f"Alignment Score: {report.get('alignment_percent', 0)}%\n")
-            if isinstance(report.get("backlink_score"), int):
-                f.write(f"Backlink Score: {report['backlink_score']}/2 (per page max)\n")
+            f.write(f"URL: {report.url}\n")
+            f.write(f"Status: {report.status}\n")
+            f.write(f"Load time: {_or_na(report.load_time_ms)} ms\n")
+            f.write(f"Backlink required: {_or_na(report.backlink_required)}\n")
+            f.write(f"Backlink found: {_or_na(report.backlink_found)}\n")
+            f.write(f"Structured Data: {report.structured_data_present}\n")
+            f.write(f"Alignment Score: {_or_zero(report.alignment_percent)}%\n")
+            if isinstance(report.backlink_score, int):
+                f.write(f"Backlink Score: {report.backlink_score}/2 (per page max)\n")
             f.write("Violations:\n")
-            if report.get("violations"):
-                for v in report["violations"]:
-                    f.write(f" - {v}\n")
+            if report.violations:
+                for line in report.violation_lines():
+                    f.write(f" - {line}\n")
             else:
                 f.write("None ✅\n")
-
-            debug = report.get("debug_log", [])
-            if debug:
-                f.write("\n--- DEBUG LOG ---\n")
-                for line in debug:
-                    f.write(f"{line}\n")
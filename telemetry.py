@@ -0,0 +1,161 @@
+# structuredweb_auditor/core/telemetry.py
+
+import sys
+import threading
+import time
+from collections import deque
+from typing import Dict, Optional, TextIO
+from urllib.parse import urlparse
+
+from config import STATUS_REFRESH_SECONDS
+from core.records import PageSummary
+
+ERROR_CODES = ("fetch_failed", "audit_error")
+RATE_WINDOW_SECONDS = 60
+
+class HostStats:
+    __slots__ = ("pages", "total_seconds", "max_seconds")
+
+    def __init__(self):
+        self.pages = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+
+    @property
+    def avg_seconds(self) -> float:
+        return self.total_seconds / self.pages if self.pages else 0.0
+
+
+class CrawlTelemetry:
+    # Counts pages as they start and finish and renders a single refreshing
+    # status line: rate, in-flight, error rate, ETA and the slowest host.
+    # Safe to call from several audit threads at once.
+
+    def __init__(self, total: Optional[int] = None, stream: Optional[TextIO] = None,
+                 refresh_seconds: float = STATUS_REFRESH_SECONDS, live: bool = True):
+        self.total = total
+        self.stream = stream if stream is not None else sys.stderr
+        self.refresh_seconds = refresh_seconds
+        self.live = live
+        self.started_at = time.monotonic()
+        self.done = 0
+        self.errors = 0
+        self.in_flight = 0
+        self.hosts: Dict[str, HostStats] = {}
+        self._recent = deque()  # finish times inside the rate window
+        self._lock = threading.Lock()
+        self._last_render = 0.0
+        self._tty = hasattr(self.stream, "isatty") and self.stream.isatty()
+
+    def page_started(self) -> float:
+        with self._lock:
+            self.in_flight += 1
+        return time.monotonic()
+
+    def page_finished(self, url: str, summary: Optional[PageSummary], started: float):
+        now = time.monotonic()
+        elapsed = now - started
+        host = urlparse(url).netloc.lower()
+        failed = summary is None or any(v.code in ERROR_CODES for v in summary.violations)
+
+        with self._lock:
+            self.in_flight -= 1
+            self.done += 1
+            self.errors += failed
+            stats = self.hosts.setdefault(host, HostStats())
+            stats.pages += 1
+            stats.total_seconds += elapsed
+            stats.max_seconds = max(stats.max_seconds, elapsed)
+            self._recent.append(now)
+            while self._recent and now - self._recent[0] > RATE_WINDOW_SECONDS:
+                self._recent.popleft()
+            due = now - self._last_render >= self.refresh_seconds
+            if due:
+                self._last_render = now
+        if self.live and due:
+            self.render()
+
+    def pages_per_second(self) -> float:
+        with self._lock:
+            # At least a second, so the first pages don't report absurd rates
+            window = min(max(time.monotonic() - self.started_at, 1.0), RATE_WINDOW_SECONDS)
+            return len(self._recent) / window
+
+    def eta_seconds(self) -> Optional[float]:
+        rate = self.pages_per_second()
+        if self.total is None or rate <= 0:
+            return None
+        return max(self.total - self.done, 0) / rate
+
+    def snapshot(self) -> Dict:
+        rate = self.pages_per_second()
+        eta = self.eta_seconds()
+        with self._lock:
+            return {
+                "done": self.done,
+                "total": self.total,
+                "in_flight": self.in_flight,
+                "errors": self.errors,
+                "error_rate": self.errors / self.done if self.done else 0.0,
+                "pages_per_second": rate,
+                "eta_seconds": eta,
+                "elapsed_seconds": time.monotonic() - self.started_at,
+                "hosts": {
+                    host: {"pages": s.pages, "avg_seconds": s.avg_seconds, "max_seconds": s.max_seconds}
+                    for host, s in self.hosts.items()
+                },
+            }
+
+    def status_line(self) -> str:
+        snap = self.snapshot()
+        progress = f"{snap['done']}/{snap['total']}" if snap["total"] is not None else str(snap["done"])
+        parts = [
+            f"[{progress}]",
+            f"{snap['pages_per_second']:.1f} pages/s",
+            f"{snap['in_flight']} in flight",
+            f"{snap['error_rate']:.1%} errors",
+        ]
+        if snap["eta_seconds"] is not None:
+            minutes, seconds = divmod(int(snap["eta_seconds"]), 60)
+            parts.append(f"ETA {minutes:02d}:{seconds:02d}")
+        if snap["hosts"]:
+            host, stats = max(snap["hosts"].items(), key=lambda item: item[1]["avg_seconds"])
+            parts.append(f"slowest {host} {stats['avg_seconds'] * 1000:.0f} ms")
+        return "  " + " · ".join(parts)
+
+    def render(self):
+        # Redraws in place on a terminal; elsewhere (logs, CI) writes plain lines
+        line = self.status_line()
+        if self._tty:
+            self.stream.write("\r\033[K" + line)
+        else:
+            self.stream.write(line + "\n")
+        self.stream.flush()
+
+    def close(self):
+        if self.live:
+            self.render()
+            if self._tty:
+                self.stream.write("\n")
+                self.stream.flush()
+
+    def metrics_text(self) -> str:
+        # Prometheus text exposition format
+        snap = self.snapshot()
+        lines = [
+            "# TYPE swa_pages_audited_total counter",
+            f"swa_pages_audited_total {snap['done']}",
+            "# TYPE swa_page_errors_total counter",
+            f"swa_page_errors_total {snap['errors']}",
+            "# TYPE swa_pages_in_flight gauge",
+            f"swa_pages_in_flight {snap['in_flight']}",
+            "# TYPE swa_pages_per_second gauge",
+            f"swa_pages_per_second {snap['pages_per_second']:.4f}",
+            "# TYPE swa_host_pages_total counter",
+        ]
+        lines += [f'swa_host_pages_total{{host="{host}"}} {s["pages"]}' for host, s in snap["hosts"].items()]
+        lines.append("# TYPE swa_host_audit_seconds_avg gauge")
+        lines += [f'swa_host_audit_seconds_avg{{host="{host}"}} {s["avg_seconds"]:.4f}' for host, s in snap["hosts"].items()]
+        lines.append("# TYPE swa_host_audit_seconds_max gauge")
+        lines += [f'swa_host_audit_seconds_max{{host="{host}"}} {s["max_seconds"]:.4f}' for host, s in snap["hosts"].items()]
+        return "\n".join(lines) + "\n"
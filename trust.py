@@ -1,113 +1,107 @@
-from bs4 import BeautifulSoup
 from urllib.parse import urlparse
+from typing import Optional
 import json
 
+from core.jsonld_index import JsonLdIndex
+from core.records import TrustResult
+from core.urls import canonical_path
+
 REQUIRED_BACKLINK_URL = "https://structuredweb.org/verify"
 REQUIRED_PATHS = {"/", "/verify.html", "/verify.json", "/verify"}
 
-def find_backlink_in_json(obj) -> bool:
-    if isinstance(obj, dict):
-        for k, v in obj.items():
-            if k.lower() == "ispartof" and isinstance(v, dict):
-                if v.get("url", "").strip().lower() == REQUIRED_BACKLINK_URL:
-                    return True
-            if k.lower() == "sameas":
-                if isinstance(v, list):
-                    if REQUIRED_BACKLINK_URL in [str(item).strip().lower() for item in v]:
-                        return True
-            if isinstance(v, (dict, list)):
-                if find_backlink_in_json(v):
-                    return True
-            elif isinstance(v, str):
-                if v.strip().lower() == REQUIRED_BACKLINK_URL:
-                    return True
-    elif isinstance(obj, list):
-        for item in obj:
-            if find_backlink_in_json(item):
+def has_backlink(index: JsonLdIndex) -> bool:
+    # Any property holding the URL counts (isPartOf.url, url, sameAs, ...);
+    # sameAs may also list it among other profiles.
+    if index.has_value(REQUIRED_BACKLINK_URL):
+        return True
+    for same_as in index.get("sameas"):
+        if isinstance(same_as, list):
+            if REQUIRED_BACKLINK_URL in [str(item).strip().lower() for item in same_as]:
                 return True
     return False
 
-def audit_backlink(url: str, html_content: str) -> dict:
+def find_backlink_in_json(obj) -> bool:
+    return has_backlink(JsonLdIndex([obj]))
+
+def audit_backlink(url: str, html_content: str, json_ld_index: Optional[JsonLdIndex] = None) -> TrustResult:
+    # Pass the page's index from audit_schema to skip re-parsing its JSON-LD
     parsed = urlparse(url)
-    path = (parsed.path or "/").rstrip("/") or "/"
+    path = canonical_path(parsed.path)
     is_verify_html = path in ["/verify", "/verify.html"]
     is_verify_json = path == "/verify.json"
     is_home = path == "/"
 
-    result = {
-        "status": "PASS",
-        "violations": [],
-        "required": path in REQUIRED_PATHS,
-        "backlink_found": False,
-        "html_backlink": False,
-        "sd_backlink": False,
-        "backlink_score": None
-    }
+    result = TrustResult(required=path in REQUIRED_PATHS)
 
     found_json = False
     found_html = False
 
     if is_verify_json:
-        try:
-            data = json.loads(html_content)
-            found_json = find_backlink_in_json(data)
-        except json.JSONDecodeError:
-            found_json = False
-        result["sd_backlink"] = found_json
+        if json_ld_index is not None:
+            found_json = has_backlink(json_ld_index)
+        else:
+            try:
+                data = json.loads(html_content)
+                found_json = find_backlink_in_json(data)
+            except json.JSONDecodeError:
+                found_json = False
+        result.sd_backlink = found_json
         if not found_json:
-            result["status"] = "FAIL"
-            result["violations"].append("Missing required isPartOf backlink in /verify.json structured data.")
+            result.fail("verify_json_backlink")
     else:
-        soup = BeautifulSoup(html_content, "html.parser")
+        from bs4 import BeautifulSoup
+        soup = None
 
         # Check JSON-LD
-        for script in soup.find_all("script", type="application/ld+json"):
-            try:
-                data = json.loads(script.string or "")
-                if find_backlink_in_json(data):
-                    found_json = True
-                    break
-            except json.JSONDecodeError:
-                continue
-        result["sd_backlink"] = found_json
+        if json_ld_index is not None:
+            found_json = has_backlink(json_ld_index)
+        else:
+            soup = BeautifulSoup(html_content, "html.parser")
+            for script in soup.find_all("script", type="application/ld+json"):
+                try:
+                    data = json.loads(script.string or "")
+                    if find_backlink_in_json(data):
+                        found_json = True
+                        break
+                except json.JSONDecodeError:
+                    continue
+        result.sd_backlink = found_json
 
         if path in REQUIRED_PATHS and not found_json:
-            result["status"] = "FAIL"
-            result["violations"].append(f"{path} is missing isPartOf backlink in structured data.")
+            result.fail("sd_backlink_missing", path)
 
         # Strict visible HTML anchor check
         if is_verify_html:
+            soup = soup or BeautifulSoup(html_content, "html.parser")
             for tag in soup.find_all("a", href=True):
                 href = tag["href"].strip().lower()
                 text = tag.get_text(strip=True).lower()
                 if href == REQUIRED_BACKLINK_URL and "structuredweb.org/verify" in text:
                     found_html = True
                     break
-            result["html_backlink"] = found_html
+            result.html_backlink = found_html
             if not found_html:
-                result["status"] = "FAIL"
-                result["violations"].append(f"{path} is missing visible HTML link to {REQUIRED_BACKLINK_URL}")
+                result.fail("html_backlink_missing", path, REQUIRED_BACKLINK_URL)
 
     # Score logic
     if path in REQUIRED_PATHS:
         score = 0
-        if result["sd_backlink"]:
+        if result.sd_backlink:
             score += 1
-        if is_verify_html and result["html_backlink"]:
+        if is_verify_html and result.html_backlink:
             score += 1
-        result["backlink_score"] = score
+        result.backlink_score = score
     else:
-        result["backlink_score"] = None
+        result.backlink_score = None
 
-    result["backlink_found"] = result["sd_backlink"] or result["html_backlink"]
+    result.backlink_found = result.sd_backlink or result.html_backlink
 
     # Verify.html must contain both
-    if is_verify_html and (not result["sd_backlink"] or not result["html_backlink"]):
-        result["status"] = "FAIL"
-        result["violations"].append(f"{path} must contain both structured data and visible HTML backlink.")
+    if is_verify_html and (not result.sd_backlink or not result.html_backlink):
+        result.fail("verify_backlink_both", path)
 
     # Non-required routes skip backlink reporting
     if path not in REQUIRED_PATHS:
-        result["violations"] = []
+        result.violations = []
 
     return result
@@ -0,0 +1,53 @@
+# structuredweb_auditor/core/urls.py
+
+import re
+from typing import Dict, Iterable, List
+from urllib.parse import urlsplit, urlunsplit
+
+# Sitemaps across the mesh list the same page several ways: with and without
+# a trailing slash, over http and https, and as /index.html. canonical_url
+# maps all of those to one key so each page is audited (and fetched) once.
+
+INDEX_FILES = ("index.html", "index.htm")
+DEFAULT_PORTS = {"http": 80, "https": 443}
+# A bare DNS name: no scheme, port, path, credentials or "..", so it is safe
+# to put into a URL and into a report file name
+HOSTNAME = re.compile(r"(?=.{1,253}$)[a-z0-9](?:[a-z0-9-]{0,61}[a-z0-9])?(?:\.[a-z0-9](?:[a-z0-9-]{0,61}[a-z0-9])?)*")
+
+def is_hostname(value: str) -> bool:
+    return HOSTNAME.fullmatch(value) is not None
+
+def canonical_path(path: str) -> str:
+    head, _, last = (path or "/").rpartition("/")
+    if last.lower() in INDEX_FILES:
+        path = head
+    return path.rstrip("/") or "/"
+
+def canonical_url(url: str) -> str:
+    url = url.strip()
+    try:
+        parsed = urlsplit(url)
+        port = parsed.port
+    except ValueError:
+        return url
+    scheme = parsed.scheme.lower()
+    host = (parsed.hostname or "").lower()
+    if port is not None and port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{port}"
+    if scheme in DEFAULT_PORTS:
+        scheme = "https"
+    return urlunsplit((scheme, host, canonical_path(parsed.path), parsed.query, ""))
+
+def dedupe_urls(urls: Iterable[str]) -> List[str]:
+    # Keeps the first spelling of each page in its first position, except that
+    # an https spelling replaces an http one seen earlier.
+    chosen: Dict[str, str] = {}
+    for url in urls:
+        url = url.strip()
+        if not url:
+            continue
+        key = canonical_url(url)
+        kept = chosen.get(key)
+        if kept is None or (kept.lower().startswith("http://") and url.lower().startswith("https://")):
+            chosen[key] = url
+    return list(chosen.values())
@@ -0,0 +1,405 @@
+# structuredweb_auditor/core/work_queue.py
+
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import closing
+from typing import Dict, List, Optional, Tuple
+
+# A run is a set of shards (URLs of one host). Workers lease a shard, audit it,
+# renew the lease as they go and hand back page summaries as plain dicts. A
+# lease that is not renewed in time expires and the shard goes back to the
+# pool, so a lost worker's shards are picked up by the others. Only the
+# worker currently holding a shard can renew or complete it.
+#
+# Every reset starts a new run, and shard ids are "<run>:<n>", so a worker
+# still busy with a shard from an earlier run can never complete a shard of
+# the current one.
+
+class Shard:
+    __slots__ = ("id", "host", "urls")
+
+    def __init__(self, id: str, host: str, urls: List[str]):
+        self.id = id
+        self.host = host
+        self.urls = urls
+
+
+def _new_run_id() -> str:
+    return uuid.uuid4().hex[:12]
+
+def _split_shard_id(shard_id: str) -> Tuple[str, str]:
+    run, _, n = shard_id.partition(":")
+    return run, n
+
+
+class WorkQueue:
+    def reset(self):
+        # Starts a new, empty run
+        raise NotImplementedError
+
+    def put_shards(self, shards: List[Tuple[str, List[str]]]) -> List[str]:
+        raise NotImplementedError
+
+    def lease(self, worker_id: str, lease_seconds: float) -> Optional[Shard]:
+        raise NotImplementedError
+
+    def renew(self, shard_id: str, worker_id: str, lease_seconds: float) -> bool:
+        raise NotImplementedError
+
+    def complete(self, shard_id: str, worker_id: str, summaries: List[Dict]) -> bool:
+        raise NotImplementedError
+
+    def progress(self) -> Tuple[int, int]:
+        # (completed shards, total shards)
+        raise NotImplementedError
+
+    def results(self) -> Dict[str, List[Dict]]:
+        raise NotImplementedError
+
+    def finished(self) -> bool:
+        done, total = self.progress()
+        return total > 0 and done == total
+
+
+class SQLiteWorkQueue(WorkQueue):
+    # Good for tests and for workers sharing one machine or a reliable shared disk
+
+    def __init__(self, path: str):
+        self.path = path
+        with closing(self._connect()) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS shards ("
+                " id INTEGER PRIMARY KEY, host TEXT NOT NULL, urls TEXT NOT NULL,"
+                " worker TEXT, lease_until REAL, attempts INTEGER NOT NULL DEFAULT 0, results TEXT, run TEXT)"
+            )
+            if "run" not in [row[1] for row in conn.execute("PRAGMA table_info(shards)")]:
+                conn.execute("ALTER TABLE shards ADD COLUMN run TEXT")
+            conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=30, isolation_level=None)
+
+    @staticmethod
+    def _current_run(conn: sqlite3.Connection) -> Optional[str]:
+        row = conn.execute("SELECT value FROM meta WHERE key = 'run'").fetchone()
+        return row[0] if row else None
+
+    def reset(self):
+        with closing(self._connect()) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute("DELETE FROM shards")
+            conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('run', ?)", (_new_run_id(),))
+            conn.execute("COMMIT")
+
+    def put_shards(self, shards: List[Tuple[str, List[str]]]) -> List[str]:
+        with closing(self._connect()) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            run = self._current_run(conn)
+            if run is None:
+                run = _new_run_id()
+                conn.execute("INSERT INTO meta (key, value) VALUES ('run', ?)", (run,))
+            ids = []
+            for host, urls in shards:
+                cur = conn.execute("INSERT INTO shards (host, urls, run) VALUES (?, ?, ?)", (host, json.dumps(urls), run))
+                ids.append(f"{run}:{cur.lastrowid}")
+            conn.execute("COMMIT")
+            return ids
+
+    def lease(self, worker_id: str, lease_seconds: float) -> Optional[Shard]:
+        now = time.time()
+        with closing(self._connect()) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT id, host, urls, run FROM shards WHERE results IS NULL"
+                " AND (lease_until IS NULL OR lease_until < ?) ORDER BY id LIMIT 1",
+                (now,),
+            ).fetchone()
+            if row is not None:
+                conn.execute(
+                    "UPDATE shards SET worker = ?, lease_until = ?, attempts = attempts + 1 WHERE id = ?",
+                    (worker_id, now + lease_seconds, row[0]),
+                )
+            conn.execute("COMMIT")
+        return Shard(f"{row[3]}:{row[0]}", row[1], json.loads(row[2])) if row else None
+
+    def _update_owned(self, shard_id: str, worker_id: str, assignments: str, values: tuple) -> bool:
+        # Applies an UPDATE only while worker_id holds the shard in the current run
+        run, n = _split_shard_id(shard_id)
+        if not n.isdigit():
+            return False
+        with closing(self._connect()) as conn:
+            cur = conn.execute(
+                f"UPDATE shards SET {assignments} WHERE id = ? AND run = ? AND worker = ? AND results IS NULL"
+                " AND run = (SELECT value FROM meta WHERE key = 'run')",
+                values + (int(n), run, worker_id),
+            )
+            return cur.rowcount > 0
+
+    def renew(self, shard_id: str, worker_id: str, lease_seconds: float) -> bool:
+        return self._update_owned(shard_id, worker_id, "lease_until = ?", (time.time() + lease_seconds,))
+
+    def complete(self, shard_id: str, worker_id: str, summaries: List[Dict]) -> bool:
+        return self._update_owned(
+            shard_id, worker_id, "results = ?, lease_until = NULL", (json.dumps(summaries, ensure_ascii=False),)
+        )
+
+    def progress(self) -> Tuple[int, int]:
+        with closing(self._connect()) as conn:
+            done, total = conn.execute("SELECT COUNT(results), COUNT(*) FROM shards").fetchone()
+            return done, total
+
+    def results(self) -> Dict[str, List[Dict]]:
+        with closing(self._connect()) as conn:
+            rows = conn.execute("SELECT id, run, results FROM shards WHERE results IS NOT NULL").fetchall()
+            return {f"{run}:{shard_id}": json.loads(payload) for shard_id, run, payload in rows}
+
+
+def _text(value) -> Optional[str]:
+    return value.decode("utf-8") if isinstance(value, bytes) else value
+
+
+class RedisWorkQueue(WorkQueue):
+    # Works against any client with the redis-py command methods used below:
+    # a real redis.Redis for multi-machine runs, or LocalRedis in-process.
+    # "<prefix>:run" names the current run; everything else lives under
+    # "<prefix>:<run>:..." and is dropped when the next run starts.
+    RUN_KEYS = ("next_id", "total", "shards", "pending", "processing", "leases", "owners", "results")
+
+    def __init__(self, client, prefix: str = "swa"):
+        self.client = client
+        self.prefix = prefix
+
+    def _current_run(self) -> Optional[str]:
+        return _text(self.client.get(f"{self.prefix}:run"))
+
+    def _run_key(self, run: str, name: str) -> str:
+        return f"{self.prefix}:{run}:{name}"
+
+    def _key(self, name: str) -> str:
+        return self._run_key(self._current_run() or "", name)
+
+    def _owns(self, shard_id: str, worker_id: str) -> bool:
+        run, _ = _split_shard_id(shard_id)
+        return (
+            run == self._current_run()
+            and _text(self.client.hget(self._run_key(run, "owners"), shard_id)) == worker_id
+            and not self.client.hexists(self._run_key(run, "results"), shard_id)
+        )
+
+    def reset(self):
+        previous = self._current_run()
+        self.client.set(f"{self.prefix}:run", _new_run_id())
+        if previous:
+            self.client.delete(*[self._run_key(previous, k) for k in self.RUN_KEYS])
+
+    def put_shards(self, shards: List[Tuple[str, List[str]]]) -> List[str]:
+        run = self._current_run()
+        if run is None:
+            self.reset()
+            run = self._current_run()
+        ids = []
+        for host, urls in shards:
+            shard_id = f"{run}:{self.client.incr(self._run_key(run, 'next_id'))}"
+            self.client.hset(self._run_key(run, "shards"), shard_id, json.dumps({"host": host, "urls": urls}))
+            self.client.rpush(self._run_key(run, "pending"), shard_id)
+            ids.append(shard_id)
+        self.client.incr(self._run_key(run, "total"), len(ids))
+        return ids
+
+    def lease(self, worker_id: str, lease_seconds: float) -> Optional[Shard]:
+        # A shard is always in pending or processing: LMOVE takes it from one
+        # to the other in a single command, and it only leaves processing once
+        # it has a result or has been pushed back to pending.
+        now = time.time()
+        run = self._current_run()
+        if run is None:
+            return None
+        pending, processing = self._run_key(run, "pending"), self._run_key(run, "processing")
+        leases, results = self._run_key(run, "leases"), self._run_key(run, "results")
+
+        # A worker that died between LMOVE and ZADD left its shard in processing
+        # without a lease; give it one now so it expires like any other
+        for shard_id in self.client.lrange(processing, 0, -1):
+            if self.client.hexists(results, shard_id):
+                self.client.lrem(processing, 0, shard_id)
+            elif self.client.zscore(leases, shard_id) is None:
+                self.client.zadd(leases, {shard_id: now + lease_seconds}, nx=True)
+
+        # Expired leases go back to the pool; zrem decides which reclaimer wins.
+        # Push before removing, so a crash here duplicates a shard rather than losing it.
+        for shard_id in self.client.zrangebyscore(leases, 0, now):
+            if self.client.zrem(leases, shard_id):
+                self.client.rpush(pending, shard_id)
+                self.client.lrem(processing, 0, shard_id)
+
+        while True:
+            shard_id = _text(self.client.lmove(pending, processing, "LEFT", "RIGHT"))
+            if shard_id is None:
+                return None
+            if self.client.hexists(results, shard_id):
+                self.client.lrem(processing, 0, shard_id)
+                continue
+            self.client.zadd(leases, {shard_id: now + lease_seconds})
+            self.client.hset(self._run_key(run, "owners"), shard_id, worker_id)
+            data = self.client.hget(self._run_key(run, "shards"), shard_id)
+            if data is None:  # a new run started meanwhile
+                return None
+            data = json.loads(data)
+            return Shard(shard_id, data["host"], data["urls"])
+
+    def renew(self, shard_id: str, worker_id: str, lease_seconds: float) -> bool:
+        if not self._owns(shard_id, worker_id):
+            return False
+        self.client.zadd(self._key("leases"), {shard_id: time.time() + lease_seconds})
+        return True
+
+    def complete(self, shard_id: str, worker_id: str, summaries: List[Dict]) -> bool:
+        if not self._owns(shard_id, worker_id):
+            return False
+        if not self.client.hsetnx(self._key("results"), shard_id, json.dumps(summaries, ensure_ascii=False)):
+            return False
+        self.client.zrem(self._key("leases"), shard_id)
+        self.client.lrem(self._key("processing"), 0, shard_id)
+        self.client.hdel(self._key("owners"), shard_id)
+        return True
+
+    def progress(self) -> Tuple[int, int]:
+        return self.client.hlen(self._key("results")), int(self.client.get(self._key("total")) or 0)
+
+    def results(self) -> Dict[str, List[Dict]]:
+        return {
+            _text(shard_id): json.loads(payload)
+            for shard_id, payload in self.client.hgetall(self._key("results")).items()
+        }
+
+
+class LocalRedis:
+    # In-process stand-in for the handful of Redis commands RedisWorkQueue uses
+
+    def __init__(self):
+        self._data: Dict[str, object] = {}
+        self._lock = threading.Lock()
+
+    def set(self, name, value):
+        with self._lock:
+            self._data[name] = value
+            return True
+
+    def delete(self, *names):
+        with self._lock:
+            return sum(1 for name in names if self._data.pop(name, None) is not None)
+
+    def get(self, name):
+        with self._lock:
+            return self._data.get(name)
+
+    def incr(self, name, amount=1):
+        with self._lock:
+            self._data[name] = int(self._data.get(name, 0)) + amount
+            return self._data[name]
+
+    def hset(self, name, key, value):
+        with self._lock:
+            h = self._data.setdefault(name, {})
+            created = key not in h
+            h[key] = value
+            return int(created)
+
+    def hsetnx(self, name, key, value):
+        with self._lock:
+            h = self._data.setdefault(name, {})
+            if key in h:
+                return 0
+            h[key] = value
+            return 1
+
+    def hget(self, name, key):
+        with self._lock:
+            return self._data.get(name, {}).get(key)
+
+    def hexists(self, name, key):
+        with self._lock:
+            return key in self._data.get(name, {})
+
+    def hdel(self, name, *keys):
+        with self._lock:
+            h = self._data.get(name, {})
+            return sum(1 for key in keys if h.pop(key, None) is not None)
+
+    def hlen(self, name):
+        with self._lock:
+            return len(self._data.get(name, {}))
+
+    def hgetall(self, name):
+        with self._lock:
+            return dict(self._data.get(name, {}))
+
+    def rpush(self, name, *values):
+        with self._lock:
+            items = self._data.setdefault(name, [])
+            items.extend(values)
+            return len(items)
+
+    def lrange(self, name, start, end):
+        with self._lock:
+            items = self._data.get(name, [])
+            return list(items[start:] if end == -1 else items[start:end + 1])
+
+    def lrem(self, name, count, value):
+        # Only count=0 (remove every occurrence) is used
+        with self._lock:
+            items = self._data.get(name, [])
+            kept = [item for item in items if item != value]
+            self._data[name] = kept
+            return len(items) - len(kept)
+
+    def lmove(self, first_list, second_list, src="LEFT", dest="RIGHT"):
+        with self._lock:
+            items = self._data.get(first_list)
+            if not items:
+                return None
+            value = items.pop(0 if src == "LEFT" else -1)
+            target = self._data.setdefault(second_list, [])
+            target.insert(0 if dest == "LEFT" else len(target), value)
+            return value
+
+    def zadd(self, name, mapping, nx=False):
+        with self._lock:
+            z = self._data.setdefault(name, {})
+            added = sum(1 for member in mapping if member not in z)
+            z.update({m: score for m, score in mapping.items() if not (nx and m in z)})
+            return added
+
+    def zscore(self, name, value):
+        with self._lock:
+            return self._data.get(name, {}).get(value)
+
+    def zrem(self, name, *members):
+        with self._lock:
+            z = self._data.get(name, {})
+            return sum(1 for member in members if z.pop(member, None) is not None)
+
+    def zrangebyscore(self, name, min, max):
+        with self._lock:
+            z = self._data.get(name, {})
+            return [m for m, score in sorted(z.items(), key=lambda item: item[1]) if min <= score <= max]
+
+
+def open_queue(url: str) -> WorkQueue:
+    # sqlite:///path/to/queue.db, redis://host:6379/0, or local:// (in-process only:
+    # coordinator and workers on threads of one process, e.g. in checks)
+    if url.startswith("sqlite:///"):
+        return SQLiteWorkQueue(url[len("sqlite:///"):])
+    if url.startswith(("redis://", "rediss://")):
+        try:
+            import redis
+        except ImportError:
+            raise ValueError("redis:// queues need the 'redis' package (pip install redis).")
+        return RedisWorkQueue(redis.Redis.from_url(url))
+    if url.startswith("local://"):
+        return RedisWorkQueue(LocalRedis())
+    raise ValueError(f"Unsupported queue URL: {url}")